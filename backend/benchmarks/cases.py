@@ -0,0 +1,191 @@
+"""
+Casos da suíte de microbenchmarks (ver benchmarks/suite.py).
+
+Importa `src` no topo do módulo, por isso só deve ser importado depois
+que a suíte configurou as variáveis de ambiente do banco de teste.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from src.db.database import engine, new_session
+from src.db.partitions import ensure_partitions
+from src.documents.danfe import danfe_template, nota_snapshot, render_danfe
+from src.models.notaFiscal_model import NotaFiscal
+from src.models.registry import table_registry
+from src.models.user_model import UserModel
+from src.repositories.emitente_repository import EmitenteRepository
+from src.repositories.nota_fiscal_repository import NotaFiscalRepository
+from src.repositories.user_repository import UserRepository
+from src.schemas.nota_fiscal_schema import NotaFiscalCreate, NotaFiscalRead
+from src.security import PasswordHasher
+from src.validators.document_validator import (
+    classify_document,
+    valid_cpf_cnpj,
+    validate_documents,
+)
+from src.validators.phone_number_validator import (
+    check_phone_number,
+    valid_phone_number,
+)
+
+SEED_NOTAS = 10_000
+SEED_EMITENTES = 10_000
+USER_EMAIL = 'benchmark@example.com'
+USER_PASSWORD = 'benchmark'
+
+CASES = []
+
+
+def bench(number: int):
+    """Registra um caso da suíte, executado `number` vezes por rodada"""
+
+    def decorator(func):
+        CASES.append((func.__name__, func, number))
+        return func
+
+    return decorator
+
+
+def build_nota(index: int) -> dict:
+    return {
+        'numero_nota': str(index),
+        'serie': '1',
+        'cfop': '5102',
+        'nome_emitente': f'Emitente {index % 100}',
+        'cnpj_emitente': f'{index % 100:014d}',
+        'nome_destinatario': 'Destinatario Benchmark',
+        'cpf_ou_cnpj_destinatario': '52998224725',
+        'valor_total': Decimal('1500.00'),
+        'icms': Decimal('180.00'),
+        'pis': Decimal('9.75'),
+        'cofins': Decimal('45.00'),
+        'desconto': None,
+    }
+
+
+# Payload da API: o CNPJ precisa ter dígitos verificadores válidos
+NOTA_PAYLOAD = {**build_nota(1), 'cnpj_emitente': '11.444.777/0001-61'}
+# Coluna de documentos de um lote, com os valores repetidos de costume
+DOCUMENT_COLUMN = ['11.444.777/0001-61', '529.982.247-25'] * 500
+NOTA_ORM = NotaFiscal(**NOTA_PAYLOAD)
+NOTA_ORM.id = 1
+NOTA_ORM.created_at = NOTA_ORM.updated_at = datetime(2026, 1, 1)
+NOTA_SNAPSHOT = nota_snapshot(NOTA_ORM)
+USER_PASSWORD_HASH = PasswordHasher.hash(USER_PASSWORD)
+
+
+async def prepare_database() -> None:
+    """Cria o schema a partir dos models e popula os dados de exemplo"""
+    async with engine.begin() as connection:
+        await connection.execute(
+            text('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        )
+        await connection.run_sync(table_registry.metadata.create_all)
+        await ensure_partitions(connection)
+        await connection.execute(
+            text(
+                'INSERT INTO emitentes (name, cnpj, phone, email) '
+                "SELECT 'Empresa ' || md5(g::text), lpad(g::text, 14, '0'), "
+                "'+5511999999999', 'e' || g || '@example.com' "
+                'FROM generate_series(1, :rows) AS g'
+            ),
+            {'rows': SEED_EMITENTES},
+        )
+
+    async with new_session() as session:
+        repo = NotaFiscalRepository(session)
+        for offset in range(0, SEED_NOTAS, 1000):
+            await repo.create_many([
+                build_nota(i) for i in range(offset, offset + 1000)
+            ])
+
+        session.add(
+            UserModel(
+                name='Benchmark',
+                email=USER_EMAIL,
+                phone='+5511999999999',
+                password=USER_PASSWORD_HASH,
+            )
+        )
+        await session.commit()
+
+    async with engine.begin() as connection:
+        await connection.execute(text('ANALYZE'))
+
+
+@bench(number=3)
+def password_hash():
+    PasswordHasher.hash(USER_PASSWORD)
+
+
+@bench(number=3)
+def password_check():
+    PasswordHasher.check(USER_PASSWORD, USER_PASSWORD_HASH)
+
+
+@bench(number=2000)
+def phone_number_validation_uncached():
+    check_phone_number.__wrapped__('11999999999')
+
+
+@bench(number=2000)
+def phone_number_validation():
+    valid_phone_number('(11) 99999-9999')
+
+
+@bench(number=5000)
+def document_validation_uncached():
+    classify_document.__wrapped__('11.444.777/0001-61')
+
+
+@bench(number=5000)
+def document_validation():
+    valid_cpf_cnpj('11.444.777/0001-61')
+
+
+@bench(number=20)
+def document_validation_batch():
+    validate_documents(DOCUMENT_COLUMN)
+
+
+@bench(number=5000)
+def nota_fiscal_create_validation():
+    NotaFiscalCreate.model_validate(NOTA_PAYLOAD)
+
+
+@bench(number=5000)
+def nota_fiscal_read_from_attributes():
+    NotaFiscalRead.model_validate(NOTA_ORM)
+
+
+@bench(number=1000)
+def danfe_render_uncompiled():
+    # Layout e fontes compilados a cada documento
+    danfe_template.cache_clear()
+    render_danfe(NOTA_SNAPSHOT)
+
+
+@bench(number=1000)
+def danfe_render():
+    render_danfe(NOTA_SNAPSHOT)
+
+
+@bench(number=50)
+async def repo_nota_fiscal_list_page():
+    async with new_session() as session:
+        await NotaFiscalRepository(session).list(50)
+
+
+@bench(number=50)
+async def repo_emitente_search():
+    async with new_session() as session:
+        await EmitenteRepository(session).search('empresa a1', limit=10)
+
+
+@bench(number=200)
+async def repo_user_get_by_email():
+    async with new_session() as session:
+        await UserRepository(session).get_by_email(USER_EMAIL)
@@ -0,0 +1,147 @@
+"""
+Mede o tempo de subida a frio da aplicação: a importação de src.app em
+um processo novo, detalhada por módulo (python -X importtime), e
+opcionalmente a execução do lifespan (precisa do banco do .env).
+
+Também serve de teste de regressão: termina com código 1 quando a
+mediana passa do limite ou quando um dos módulos de LAZY_MODULES é
+executado durante a importação. tests/test_cold_start.py faz a mesma
+verificação da importação no pytest.
+
+Uso (a partir de backend/):
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 9 --max-import-ms 1200
+    python -m benchmarks.cold_start --startup --max-startup-ms 1500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Módulos carregados sob demanda (src/lazy.py), fora da subida
+LAZY_MODULES = (
+    'phonenumbers',
+    'src.importers.nfe_xml',
+    'src.documents.danfe',
+)
+
+DEFAULT_MAX_IMPORT_MS = 1500
+DEFAULT_MAX_STARTUP_MS = 1000
+
+CHILD = """
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+import src.app
+imported = time.perf_counter()
+
+async def run_lifespan():
+    async with src.app.app.router.lifespan_context(src.app.app):
+        pass
+
+if {startup}:
+    asyncio.run(run_lifespan())
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'startup_ms': (time.perf_counter() - imported) * 1000,
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[float, float]]:
+    """Módulo -> (tempo próprio, tempo acumulado) em milissegundos"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        modules[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return modules
+
+
+def run_child(startup: bool) -> tuple[dict, dict]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            CHILD.format(startup=startup),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(result.stderr)
+
+
+def report_modules(modules: dict, top: int):
+    print(f'\nMódulos com maior tempo próprio (top {top}):')
+    ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (own, cumulative) in ranked[:top]:
+        print(f'  {own:8.1f}ms  {cumulative:8.1f}ms acumulado  {name}')
+
+    packages = defaultdict(float)
+    for name, (own, _) in modules.items():
+        packages[name.split('.')[0]] += own
+    print('\nTempo próprio por pacote:')
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    for package, own in ranked[:top]:
+        print(f'  {own:8.1f}ms  {package}')
+
+
+def main(args) -> int:
+    runs = [run_child(args.startup) for _ in range(args.runs)]
+    import_ms = statistics.median(timings['import_ms'] for timings, _ in runs)
+    startup_ms = statistics.median(
+        timings['startup_ms'] for timings, _ in runs
+    )
+
+    # Detalhamento da execução com a importação mais próxima da mediana
+    _, modules = min(
+        runs, key=lambda run: abs(run[0]['import_ms'] - import_ms)
+    )
+    report_modules(modules, args.top)
+
+    print(f'\nimport src.app: mediana de {args.runs} = {import_ms:.0f}ms')
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(
+            f'importação {import_ms:.0f}ms > limite {args.max_import_ms}ms'
+        )
+    if args.startup:
+        print(f'lifespan: mediana de {args.runs} = {startup_ms:.0f}ms')
+        if startup_ms > args.max_startup_ms:
+            failures.append(
+                f'lifespan {startup_ms:.0f}ms > limite {args.max_startup_ms}ms'
+            )
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f'importados na subida: {", ".join(eager)}')
+
+    for failure in failures:
+        print(f'FALHA: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument(
+        '--max-import-ms', type=float, default=DEFAULT_MAX_IMPORT_MS
+    )
+    parser.add_argument(
+        '--startup',
+        action='store_true',
+        help='Executa também o lifespan (precisa do banco)',
+    )
+    parser.add_argument(
+        '--max-startup-ms', type=float, default=DEFAULT_MAX_STARTUP_MS
+    )
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""
+Compara o tempo de serialização de uma listagem grande de notas fiscais
+pelo caminho padrão do FastAPI (response_model + JSONResponse) com o
+caminho de src/serialization.py (TypeAdapter + dump_json).
+
+Não usa o banco: as notas são instâncias ORM montadas em memória.
+
+Uso (a partir de backend/):
+    python -m benchmarks.list_serialization --rows 50000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.models.notaFiscal_model import NotaFiscal
+from src.schemas.nota_fiscal_schema import NotaFiscalList
+from src.serialization import json_response
+
+
+def build_notas(rows: int) -> list[NotaFiscal]:
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    notas = []
+    for index in range(rows):
+        nota = NotaFiscal(
+            numero_nota=str(index),
+            serie='1',
+            cfop='5102',
+            nome_emitente='Emitente Benchmark',
+            cnpj_emitente='11222333000181',
+            nome_destinatario='Destinatario Benchmark',
+            cpf_ou_cnpj_destinatario='52998224725',
+            valor_total=Decimal('1500.00'),
+            icms=Decimal('180.00'),
+            pis=Decimal('9.75'),
+            cofins=Decimal('45.00'),
+            desconto=None,
+        )
+        nota.id = index + 1
+        nota.created_at = nota.updated_at = base + timedelta(seconds=index)
+        notas.append(nota)
+    return notas
+
+
+async def bench_fastapi(content: dict) -> tuple[float, bytes]:
+    # Mesmo caminho de uma rota com response_model que retorna um dict
+    field = create_model_field(
+        name='Response_list_notas_fiscais',
+        type_=NotaFiscalList,
+        mode='serialization',
+    )
+    start = time.perf_counter()
+    value = await serialize_response(field=field, response_content=content)
+    body = JSONResponse(value).body
+    return time.perf_counter() - start, body
+
+
+def bench_fast_path(content: dict) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    body = json_response(NotaFiscalList, content).body
+    return time.perf_counter() - start, body
+
+
+async def main(rows: int, rounds: int):
+    content = {'notas_fiscais': build_notas(rows), 'next_cursor': None}
+    # Aquece os validadores compilados dos dois caminhos
+    await bench_fastapi({'notas_fiscais': [], 'next_cursor': None})
+    bench_fast_path({'notas_fiscais': [], 'next_cursor': None})
+
+    default = min([(await bench_fastapi(content))[0] for _ in range(rounds)])
+    fast = min([bench_fast_path(content)[0] for _ in range(rounds)])
+
+    print(f'{rows} notas, melhor de {rounds} rodadas')
+    print(f'response_model + JSONResponse: {default * 1000:10.1f} ms')
+    print(f'TypeAdapter + dump_json:       {fast * 1000:10.1f} ms')
+    print(f'ganho: {default / fast:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.rounds))
@@ -0,0 +1,66 @@
+"""
+Mede a vazão de verificações de senha e a latência do event loop
+durante uma rajada de logins, comparando a chamada síncrona do bcrypt
+com a execução no pool dedicado (PasswordHasher.check_async).
+
+Uso (a partir de backend/):
+    python -m benchmarks.login_throughput --logins 64
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.security import PasswordHasher
+
+TICK_SECONDS = 0.01
+
+
+async def monitor_loop_lag(stop: asyncio.Event, lags: list[float]):
+    """Registra o atraso de cada tick em relação ao intervalo esperado"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - start - TICK_SECONDS) * 1000)
+
+
+async def blocking_login(password: str, hashed: str):
+    # Comportamento anterior: bcrypt chamado direto no handler
+    PasswordHasher.check(password, hashed)
+
+
+async def pooled_login(password: str, hashed: str):
+    await PasswordHasher.check_async(password, hashed)
+
+
+async def run(login, logins: int, password: str, hashed: str):
+    stop = asyncio.Event()
+    lags: list[float] = []
+    monitor = asyncio.create_task(monitor_loop_lag(stop, lags))
+    await asyncio.sleep(TICK_SECONDS)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    worst_lag = max(lags, default=0.0)
+    print(
+        f'{login.__name__:>15}: {logins / elapsed:7.1f} logins/s, '
+        f'maior atraso do event loop {worst_lag:8.1f}ms'
+    )
+
+
+async def main(logins: int):
+    password = 'benchmark-password'
+    hashed = PasswordHasher.hash(password)
+    await run(blocking_login, logins, password, hashed)
+    await run(pooled_login, logins, password, hashed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
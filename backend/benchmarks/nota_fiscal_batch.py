@@ -0,0 +1,97 @@
+"""
+Compara a vazão (notas/segundo) do cadastro individual de notas
+fiscais com a inserção em lote.
+
+Uso (a partir de backend/, com o banco do .env disponível):
+    python -m benchmarks.nota_fiscal_batch --total 5000 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+from src.db.database import engine, new_session
+from src.models.nota_fiscal_rollup_model import NotaFiscalDailyTotal
+from src.models.notaFiscal_model import NotaFiscal
+from src.repositories.nota_fiscal_repository import NotaFiscalRepository
+
+BENCH_PREFIX = 'BENCH-'
+# CNPJ fictício, para que a limpeza não toque nos totais de emitentes reais
+BENCH_CNPJ = '00000000000000'
+
+
+def build_nota(index: int) -> dict:
+    return {
+        'numero_nota': f'{BENCH_PREFIX}{index}',
+        'serie': '1',
+        'cfop': '5102',
+        'nome_emitente': 'Emitente Benchmark',
+        'cnpj_emitente': BENCH_CNPJ,
+        'nome_destinatario': 'Destinatario Benchmark',
+        'cpf_ou_cnpj_destinatario': '52998224725',
+        'valor_total': Decimal('1500.00'),
+        'icms': Decimal('180.00'),
+        'pis': Decimal('9.75'),
+        'cofins': Decimal('45.00'),
+        'desconto': None,
+    }
+
+
+async def bench_single(total: int) -> float:
+    async with new_session() as session:
+        repo = NotaFiscalRepository(session)
+        start = time.perf_counter()
+        for index in range(total):
+            await repo.create(NotaFiscal(**build_nota(index)))
+        return time.perf_counter() - start
+
+
+async def bench_batch(total: int, batch_size: int) -> float:
+    async with new_session() as session:
+        repo = NotaFiscalRepository(session)
+        start = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            stop = min(offset + batch_size, total)
+            notas = [build_nota(i) for i in range(offset, stop)]
+            await repo.create_many(notas)
+        return time.perf_counter() - start
+
+
+async def cleanup():
+    async with new_session() as session:
+        await session.execute(
+            delete(NotaFiscal).where(
+                NotaFiscal.numero_nota.startswith(BENCH_PREFIX)
+            )
+        )
+        await session.execute(
+            delete(NotaFiscalDailyTotal).where(
+                NotaFiscalDailyTotal.cnpj_emitente == BENCH_CNPJ
+            )
+        )
+        await session.commit()
+
+
+async def main(total: int, batch_size: int):
+    try:
+        single = await bench_single(total)
+        await cleanup()
+        batch = await bench_batch(total, batch_size)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+    print(f'individual: {total / single:10.1f} notas/s ({single:.2f}s)')
+    print(f'lote ({batch_size}): {total / batch:10.1f} notas/s ({batch:.2f}s)')
+    print(f'ganho: {single / batch:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--total', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.total, args.batch_size))
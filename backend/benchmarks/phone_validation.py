@@ -0,0 +1,89 @@
+"""
+Custo por chamada da validação de telefones antes e depois da
+memorização: análise completa a cada chamada (comportamento anterior)
+e valid_phone_number com o cache LRU, sobre uma coluna de telefones com
+números repetidos.
+
+Não usa o banco.
+
+Uso (a partir de backend/):
+    python -m benchmarks.phone_validation --rows 100000 --distinct 5000
+"""
+
+import argparse
+import random
+import time
+
+from src.validators.phone_number_validator import (
+    check_phone_number,
+    normalize_phone_number,
+    valid_phone_number,
+)
+
+FORMATS = ('({ddd}) 9{a}-{b}', '+55 {ddd} 9{a}{b}', '{ddd}9{a}{b}')
+
+
+def build_column(rows: int, distinct: int) -> list[str]:
+    """Coluna de `rows` telefones com `distinct` números diferentes"""
+    rng = random.Random(42)
+    numbers = [
+        (rng.choice((11, 21, 31, 41, 51, 61, 71, 81)), rng.randrange(10**8))
+        for _ in range(distinct)
+    ]
+    column = []
+    for _ in range(rows):
+        ddd, number = rng.choice(numbers)
+        digits = f'{number:08d}'
+        column.append(
+            rng.choice(FORMATS).format(ddd=ddd, a=digits[:4], b=digits[4:])
+        )
+    return column
+
+
+def uncached(column: list[str]):
+    # Mesmo trabalho do valid_phone_number anterior: regex e análise
+    # completa do phonenumbers em toda chamada
+    for phone_number in column:
+        check_phone_number.__wrapped__(normalize_phone_number(phone_number))
+
+
+def cached(column: list[str]):
+    for phone_number in column:
+        try:
+            valid_phone_number(phone_number)
+        except ValueError:
+            pass
+
+
+def main(rows: int, distinct: int, rounds: int):
+    column = build_column(rows, distinct)
+    print(f'{rows} telefones, {distinct} distintos, melhor de {rounds}')
+
+    baseline = None
+    for name, func in (
+        ('sem cache (anterior)', uncached),
+        ('valid_phone_number + LRU', cached),
+    ):
+        best = float('inf')
+        for _ in range(rounds):
+            # Cada rodada começa com o cache vazio
+            check_phone_number.cache_clear()
+            start = time.perf_counter()
+            func(column)
+            best = min(best, time.perf_counter() - start)
+
+        per_call = best / rows * 1e6
+        baseline = baseline or per_call
+        print(
+            f'{name:28} {per_call:8.2f}µs/telefone  '
+            f'{baseline / per_call:5.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--distinct', type=int, default=5_000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.distinct, args.rounds)
@@ -0,0 +1,129 @@
+"""
+Mede a latência (p50/p95/p99) da busca de autocomplete de emitentes e
+destinatários com uma tabela populada artificialmente, no banco
+(BaseRepository.search) e no índice de prefixos em memória
+(src/search_index.py).
+
+Uso (a partir de backend/, com o banco do .env migrado):
+    python -m benchmarks.search_autocomplete --rows 1000000 --runs 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from src.db.database import engine, new_session
+from src.repositories.destinatario_repository import DestinatarioRepository
+from src.repositories.emitente_repository import EmitenteRepository
+from src.search_index import destinatario_index, emitente_index
+
+BENCH_PREFIX = 'BENCH '
+
+SEED_SQL = {
+    'emitentes': """
+        INSERT INTO emitentes (name, cnpj, phone, email)
+        SELECT
+            'BENCH ' || md5(g::text) || ' Comercio Ltda',
+            '9' || lpad(g::text, 13, '0'),
+            '+5511999999999',
+            'bench' || g || '@example.com'
+        FROM generate_series(1, :rows) AS g
+    """,
+    'destinatarios': """
+        INSERT INTO destinatarios (name, cpf_cnpj, phone, email)
+        SELECT
+            'BENCH ' || md5(g::text) || ' Servicos',
+            '9' || lpad(g::text, 10, '0'),
+            '+5511999999999',
+            'bench' || g || '@example.com'
+        FROM generate_series(1, :rows) AS g
+    """,
+}
+
+QUERIES = ['comercio', 'servicos', 'a1b2', '9000001', '00012', 'bench 3f']
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def seed(rows: int):
+    async with new_session() as session:
+        for table, sql in SEED_SQL.items():
+            await session.execute(text(sql), {'rows': rows})
+            await session.execute(text(f'ANALYZE {table}'))
+        await session.commit()
+
+
+async def cleanup():
+    async with new_session() as session:
+        for table in SEED_SQL:
+            await session.execute(
+                text(f'DELETE FROM {table} WHERE name LIKE :prefix'),
+                {'prefix': f'{BENCH_PREFIX}%'},
+            )
+        await session.commit()
+
+
+async def measure(repo_class, runs: int) -> list[float]:
+    samples = []
+    async with new_session() as session:
+        repo = repo_class(session)
+        for _ in range(runs):
+            query = random.choice(QUERIES)
+            start = time.perf_counter()
+            await repo.search(query, limit=10)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def measure_index(index, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        query = random.choice(QUERIES)
+        start = time.perf_counter()
+        index.search(query, 10)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    print(
+        f'{name}: '
+        f'p50={statistics.median(samples):.3f}ms '
+        f'p95={percentile(samples, 95):.3f}ms '
+        f'p99={percentile(samples, 99):.3f}ms'
+    )
+
+
+async def main(rows: int, runs: int):
+    try:
+        await seed(rows)
+        pairs = (
+            (EmitenteRepository, emitente_index),
+            (DestinatarioRepository, destinatario_index),
+        )
+        for repo_class, index in pairs:
+            report(repo_class.__name__, await measure(repo_class, runs))
+
+            start = time.perf_counter()
+            await index.load()
+            print(f'  carga do índice: {time.perf_counter() - start:.1f}s')
+            report('  índice em memória', measure_index(index, runs))
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.runs))
@@ -0,0 +1,139 @@
+"""
+Suíte de microbenchmarks dos caminhos críticos do backend.
+
+Sobe um Postgres descartável com testcontainers, cria o schema a partir
+dos models, popula dados de exemplo e mede o tempo por chamada de cada
+caso de benchmarks/cases.py. O resultado é comparado com
+benchmarks/baseline.json e a execução termina com código 1 quando algum
+caso fica mais lento que o baseline além da tolerância.
+
+Uso (a partir de backend/, com Docker disponível):
+    python -m benchmarks.suite                   # compara com o baseline
+    python -m benchmarks.suite --save-baseline   # grava um novo baseline
+    python -m benchmarks.suite --threshold 0.3 -k phone
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from testcontainers.postgres import PostgresContainer
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+DEFAULT_THRESHOLD = 0.25
+POSTGRES_IMAGE = 'postgres:17-alpine'
+ROUNDS = 5
+
+
+def configure_environment(container: PostgresContainer) -> None:
+    """Aponta as configurações da aplicação para o container"""
+    os.environ.update({
+        'DATABASE_SCHEME': 'postgresql+asyncpg',
+        'DATABASE_USER': container.username,
+        'DATABASE_PASSWORD': container.password,
+        'DATABASE_DB': container.dbname,
+        'DATABASE_SERVER': container.get_container_host_ip(),
+        'DATABASE_PORT': str(container.get_exposed_port(5432)),
+    })
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret')
+    os.environ.setdefault('ALGORITHM', 'HS256')
+    os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+
+
+async def measure(func, number: int) -> float:
+    """
+    Executa ROUNDS rodadas de `number` chamadas e retorna o menor tempo
+    médio por chamada, em segundos (mesma estratégia do timeit)
+    """
+    is_async = inspect.iscoroutinefunction(func)
+    best = float('inf')
+
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(number):
+            if is_async:
+                await func()
+            else:
+                func()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f'{name:40} {seconds * 1e6:12.2f}µs  (sem baseline)')
+            continue
+
+        change = seconds / reference - 1
+        status = 'REGRESSÃO' if change > threshold else 'ok'
+        print(
+            f'{name:40} {seconds * 1e6:12.2f}µs  '
+            f'baseline {reference * 1e6:12.2f}µs  {change:+7.1%}  {status}'
+        )
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+async def run(selected: str | None) -> dict:
+    cases = importlib.import_module('benchmarks.cases')
+    await cases.prepare_database()
+
+    results = {}
+    try:
+        for name, func, number in cases.CASES:
+            if selected and selected not in name:
+                continue
+            results[name] = await measure(func, number)
+    finally:
+        await cases.engine.dispose()
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('-k', dest='selected', help='Filtra casos pelo nome')
+    args = parser.parse_args()
+
+    with PostgresContainer(POSTGRES_IMAGE, driver='asyncpg') as container:
+        configure_environment(container)
+        results = asyncio.run(run(args.selected))
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+    if args.save_baseline:
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f'Baseline gravado em {BASELINE_PATH}')
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(
+            f'{len(regressions)} caso(s) acima da tolerância de '
+            f'{args.threshold:.0%}: {", ".join(regressions)}'
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
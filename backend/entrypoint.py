@@ -1,12 +1,14 @@
+import os
 import subprocess
 import sys
-import os
+
+from src.settings import settings
 
 print('🚀 Iniciando container...')
 print(f'Python executable: {sys.executable}')
 print(f'PATH: {os.environ.get("PATH", "")}')
 
-# Executa as migrações do Alembic
+# Executa as migrações do Alembic uma única vez, antes de qualquer worker
 try:
     subprocess.run(
         [sys.executable, '-m', 'alembic', 'upgrade', 'head'], check=True
@@ -15,14 +17,39 @@ except subprocess.CalledProcessError as e:
     print(f'⚠️ Erro ao executar migrações: {e}')
     # Continua mesmo assim, caso as migrações já estejam aplicadas
 
-# Inicia o servidor Uvicorn
-subprocess.run([
+# Partições de nota_fiscal do mês atual e dos próximos, também uma única
+# vez; o worker da fila as mantém enquanto o container roda
+try:
+    subprocess.run([sys.executable, '-m', 'src.db.partitions'], check=True)
+except subprocess.CalledProcessError as e:
+    print(f'⚠️ Erro ao criar as partições: {e}')
+    # As notas de meses sem partição ficam na partição padrão
+
+command = [
     sys.executable,
     '-m',
     'uvicorn',
     'src.app:app',
     '--host',
-    '0.0.0.0',
+    settings.APP_HOST,
     '--port',
-    '8000',
-])
+    str(settings.APP_PORT),
+]
+
+if settings.SERVER_MODE == 'production':
+    workers = settings.server_workers
+    command += [
+        '--workers',
+        str(workers),
+        '--timeout-graceful-shutdown',
+        str(settings.SERVER_GRACEFUL_TIMEOUT),
+    ]
+    # O supervisor do uvicorn sobe um novo worker quando um deles
+    # encerra ao atingir o limite de requisições
+    if settings.SERVER_MAX_REQUESTS > 0:
+        command += ['--limit-max-requests', str(settings.SERVER_MAX_REQUESTS)]
+    print(f'🏭 Modo produção com {workers} workers')
+
+# Inicia o servidor Uvicorn; exec substitui este processo para que os
+# sinais de encerramento do container cheguem direto ao uvicorn
+os.execv(sys.executable, command)
@@ -0,0 +1,77 @@
+"""Nota fiscal party foreign keys
+
+Revision ID: 03162a47d320
+Revises: e0b279a70c02
+Create Date: 2026-10-18 10:46:22.881122
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '03162a47d320'
+down_revision: Union[str, Sequence[str], None] = 'e0b279a70c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Quantidade de notas (faixa de ids) atualizadas por transação na carga
+BACKFILL_BATCH_SIZE = 10_000
+
+BACKFILL_STATEMENTS = (
+    """
+    UPDATE nota_fiscal AS n
+    SET emitente_id = e.id
+    FROM emitentes AS e
+    WHERE n.id >= :start AND n.id < :stop
+      AND e.cnpj_digits = regexp_replace(n.cnpj_emitente, '[^0-9]', '', 'g')
+    """,
+    """
+    UPDATE nota_fiscal AS n
+    SET destinatario_id = d.id
+    FROM destinatarios AS d
+    WHERE n.id >= :start AND n.id < :stop
+      AND d.cpf_cnpj_digits =
+          regexp_replace(n.cpf_ou_cnpj_destinatario, '[^0-9]', '', 'g')
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Busca exata pelo documento normalizado (carga e novas notas)
+    op.create_index(op.f('ix_emitentes_cnpj_digits'), 'emitentes', ['cnpj_digits'], unique=False)
+    op.create_index(op.f('ix_destinatarios_cpf_cnpj_digits'), 'destinatarios', ['cpf_cnpj_digits'], unique=False)
+
+    op.add_column('nota_fiscal', sa.Column('emitente_id', sa.Integer(), nullable=True))
+    op.add_column('nota_fiscal', sa.Column('destinatario_id', sa.Integer(), nullable=True))
+
+    # Carga em lotes por faixa de id, cada lote na sua própria transação,
+    # para não manter todas as linhas da tabela bloqueadas de uma vez.
+    # Os índices e as chaves estrangeiras são criados depois da carga.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.scalar(sa.text('SELECT max(id) FROM nota_fiscal'))
+        for start in range(1, (max_id or 0) + 1, BACKFILL_BATCH_SIZE):
+            params = {'start': start, 'stop': start + BACKFILL_BATCH_SIZE}
+            for statement in BACKFILL_STATEMENTS:
+                connection.execute(sa.text(statement), params)
+
+    op.create_index('ix_nota_fiscal_destinatario_id_created_at_id', 'nota_fiscal', ['destinatario_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_nota_fiscal_emitente_id_created_at_id', 'nota_fiscal', ['emitente_id', 'created_at', 'id'], unique=False)
+    op.create_foreign_key('nota_fiscal_emitente_id_fkey', 'nota_fiscal', 'emitentes', ['emitente_id'], ['id'], ondelete='SET NULL')
+    op.create_foreign_key('nota_fiscal_destinatario_id_fkey', 'nota_fiscal', 'destinatarios', ['destinatario_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('nota_fiscal_destinatario_id_fkey', 'nota_fiscal', type_='foreignkey')
+    op.drop_constraint('nota_fiscal_emitente_id_fkey', 'nota_fiscal', type_='foreignkey')
+    op.drop_index('ix_nota_fiscal_emitente_id_created_at_id', table_name='nota_fiscal')
+    op.drop_index('ix_nota_fiscal_destinatario_id_created_at_id', table_name='nota_fiscal')
+    op.drop_column('nota_fiscal', 'destinatario_id')
+    op.drop_column('nota_fiscal', 'emitente_id')
+    op.drop_index(op.f('ix_destinatarios_cpf_cnpj_digits'), table_name='destinatarios')
+    op.drop_index(op.f('ix_emitentes_cnpj_digits'), table_name='emitentes')
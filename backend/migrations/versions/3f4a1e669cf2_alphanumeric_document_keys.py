@@ -0,0 +1,77 @@
+"""Alphanumeric document keys
+
+Revision ID: 3f4a1e669cf2
+Revises: 829a32d39dbf
+Create Date: 2026-10-18 12:10:41.305170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f4a1e669cf2'
+down_revision: Union[str, Sequence[str], None] = '829a32d39dbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna gerada, coluna do documento)
+DOCUMENT_KEYS = (
+    ('emitentes', 'cnpj_digits', 'cnpj'),
+    ('destinatarios', 'cpf_cnpj_digits', 'cpf_cnpj'),
+)
+
+# Notas com documento alfanumérico, ou vinculadas a um cadastro com
+# documento alfanumérico, foram vinculadas comparando só os dígitos
+RELINK_STATEMENTS = (
+    """
+    UPDATE nota_fiscal AS n
+    SET emitente_id = (
+        SELECT min(e.id) FROM emitentes AS e
+        WHERE e.cnpj_digits =
+              upper(regexp_replace(n.cnpj_emitente, '[^0-9A-Za-z]', '', 'g'))
+    )
+    WHERE n.cnpj_emitente ~ '[A-Za-z]'
+       OR n.emitente_id IN (SELECT id FROM emitentes WHERE cnpj ~ '[A-Za-z]')
+    """,
+    """
+    UPDATE nota_fiscal AS n
+    SET destinatario_id = (
+        SELECT min(d.id) FROM destinatarios AS d
+        WHERE d.cpf_cnpj_digits = upper(
+            regexp_replace(n.cpf_ou_cnpj_destinatario, '[^0-9A-Za-z]', '', 'g')
+        )
+    )
+    WHERE n.cpf_ou_cnpj_destinatario ~ '[A-Za-z]'
+       OR n.destinatario_id IN (
+           SELECT id FROM destinatarios WHERE cpf_cnpj ~ '[A-Za-z]'
+       )
+    """,
+)
+
+
+def _replace_document_keys(expression: str) -> None:
+    # A expressão de uma coluna gerada só muda recriando a coluna; os
+    # índices dela são recriados em seguida
+    for table, column, source in DOCUMENT_KEYS:
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+        op.drop_column(table, column)
+        op.add_column(table, sa.Column(column, sa.String(length=20), sa.Computed(expression.format(source), persisted=True), nullable=True))
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+        op.create_index(f'ix_{table}_{column}_trgm', table, [column], unique=False, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_document_keys("upper(regexp_replace({}, '[^0-9A-Za-z]', '', 'g'))")
+    for statement in RELINK_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Os vínculos refeitos no upgrade continuam corretos e são mantidos
+    _replace_document_keys("regexp_replace({}, '[^0-9]', '', 'g')")
@@ -0,0 +1,43 @@
+"""Trigram search indexes
+
+Revision ID: a5e2b283f621
+Revises: ac2f8b950212
+Create Date: 2026-10-18 10:02:17.884312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5e2b283f621'
+down_revision: Union[str, Sequence[str], None] = 'ac2f8b950212'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column('emitentes', sa.Column('cnpj_digits', sa.String(length=20), sa.Computed("regexp_replace(cnpj, '[^0-9]', '', 'g')", persisted=True), nullable=True))
+    op.add_column('destinatarios', sa.Column('cpf_cnpj_digits', sa.String(length=20), sa.Computed("regexp_replace(cpf_cnpj, '[^0-9]', '', 'g')", persisted=True), nullable=True))
+
+    op.create_index('ix_emitentes_name_trgm', 'emitentes', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_emitentes_cnpj_digits_trgm', 'emitentes', ['cnpj_digits'], unique=False, postgresql_using='gin', postgresql_ops={'cnpj_digits': 'gin_trgm_ops'})
+    op.create_index('ix_destinatarios_name_trgm', 'destinatarios', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_destinatarios_cpf_cnpj_digits_trgm', 'destinatarios', ['cpf_cnpj_digits'], unique=False, postgresql_using='gin', postgresql_ops={'cpf_cnpj_digits': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_destinatarios_cpf_cnpj_digits_trgm', table_name='destinatarios')
+    op.drop_index('ix_destinatarios_name_trgm', table_name='destinatarios')
+    op.drop_index('ix_emitentes_cnpj_digits_trgm', table_name='emitentes')
+    op.drop_index('ix_emitentes_name_trgm', table_name='emitentes')
+
+    op.drop_column('destinatarios', 'cpf_cnpj_digits')
+    op.drop_column('emitentes', 'cnpj_digits')
+    # A extensão pg_trgm é mantida, pois pode ser usada por outros objetos
@@ -0,0 +1,28 @@
+"""Nota fiscal keyset index
+
+Revision ID: ac2f8b950212
+Revises: 5537e0cd6c6a
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ac2f8b950212'
+down_revision: Union[str, Sequence[str], None] = '5537e0cd6c6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_nota_fiscal_created_at_id', 'nota_fiscal', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_nota_fiscal_created_at_id', table_name='nota_fiscal')
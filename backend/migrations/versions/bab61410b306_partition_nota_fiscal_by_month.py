@@ -0,0 +1,128 @@
+"""Partition nota_fiscal by month
+
+Revision ID: bab61410b306
+Revises: 03162a47d320
+Create Date: 2026-10-18 11:02:37.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bab61410b306'
+down_revision: Union[str, Sequence[str], None] = '03162a47d320'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partições criadas além do mês atual; as seguintes ficam a cargo da
+# aplicação (src/db/partitions.py)
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, numero_nota, serie, cfop, nome_emitente, cnpj_emitente, '
+    'nome_destinatario, cpf_ou_cnpj_destinatario, valor_total, icms, pis, '
+    'cofins, desconto, emitente_id, destinatario_id, created_at, updated_at'
+)
+
+INDEXES = {
+    'ix_nota_fiscal_created_at_id': ['created_at', 'id'],
+    'ix_nota_fiscal_emitente_id_created_at_id': ['emitente_id', 'created_at', 'id'],
+    'ix_nota_fiscal_destinatario_id_created_at_id': ['destinatario_id', 'created_at', 'id'],
+}
+
+# Uma partição por mês, do mês da nota mais antiga até MONTHS_AHEAD
+# meses depois do atual, além da partição padrão
+CREATE_PARTITIONS = f"""
+DO $$
+DECLARE
+    month date;
+BEGIN
+    CREATE TABLE nota_fiscal_default PARTITION OF nota_fiscal DEFAULT;
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', coalesce(
+                (SELECT min(created_at) FROM nota_fiscal_unpartitioned),
+                now()
+            )),
+            date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF nota_fiscal FOR VALUES FROM (%L) TO (%L)',
+            'nota_fiscal_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+    END LOOP;
+END
+$$;
+"""
+
+
+def _columns() -> list:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('nota_fiscal_id_seq')"), nullable=False),
+        sa.Column('numero_nota', sa.String(length=50), nullable=False),
+        sa.Column('serie', sa.String(length=20), nullable=False),
+        sa.Column('cfop', sa.String(length=10), nullable=False),
+        sa.Column('nome_emitente', sa.String(length=100), nullable=False),
+        sa.Column('cnpj_emitente', sa.String(length=18), nullable=False),
+        sa.Column('nome_destinatario', sa.String(length=100), nullable=False),
+        sa.Column('cpf_ou_cnpj_destinatario', sa.String(length=18), nullable=False),
+        sa.Column('valor_total', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('icms', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('pis', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('cofins', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('desconto', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('emitente_id', sa.Integer(), nullable=True),
+        sa.Column('destinatario_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['emitente_id'], ['emitentes.id'], name='nota_fiscal_emitente_id_fkey', ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['destinatario_id'], ['destinatarios.id'], name='nota_fiscal_destinatario_id_fkey', ondelete='SET NULL'),
+    ]
+
+
+def _rename_current(new_name: str) -> None:
+    """Renomeia a tabela atual e libera os nomes de chave e índices"""
+    op.rename_table('nota_fiscal', new_name)
+    op.execute(f'ALTER TABLE {new_name} RENAME CONSTRAINT nota_fiscal_pkey TO {new_name}_pkey')
+    for name in INDEXES:
+        op.drop_index(name, table_name=new_name)
+
+
+def _finish(old_name: str) -> None:
+    """Copia as linhas, move a sequência do id e recria os índices"""
+    op.execute(f'INSERT INTO nota_fiscal ({COLUMNS}) SELECT {COLUMNS} FROM {old_name}')
+    # A sequência pertence à coluna antiga e seria removida junto com ela
+    op.execute('ALTER SEQUENCE nota_fiscal_id_seq OWNED BY nota_fiscal.id')
+    op.drop_table(old_name)
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'nota_fiscal', columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_current('nota_fiscal_unpartitioned')
+    op.create_table('nota_fiscal',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='nota_fiscal_pkey'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute(CREATE_PARTITIONS)
+    _finish('nota_fiscal_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_current('nota_fiscal_partitioned')
+    op.create_table('nota_fiscal',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', name='nota_fiscal_pkey')
+    )
+    # Remove a tabela particionada junto com as partições
+    _finish('nota_fiscal_partitioned')
@@ -0,0 +1,30 @@
+"""Btree indexes on name keys
+
+Revision ID: c0dd58865e1b
+Revises: e8c5c1215e99
+Create Date: 2026-10-18 11:47:39.187434
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0dd58865e1b'
+down_revision: Union[str, Sequence[str], None] = 'e8c5c1215e99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_destinatarios_name_key_id', 'destinatarios', ['name_key', 'id'], unique=False)
+    op.create_index('ix_emitentes_name_key_id', 'emitentes', ['name_key', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_emitentes_name_key_id', table_name='emitentes')
+    op.drop_index('ix_destinatarios_name_key_id', table_name='destinatarios')
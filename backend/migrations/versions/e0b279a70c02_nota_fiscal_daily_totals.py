@@ -0,0 +1,63 @@
+"""Nota fiscal daily totals
+
+Revision ID: e0b279a70c02
+Revises: a5e2b283f621
+Create Date: 2026-10-18 11:20:45.219047
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e0b279a70c02'
+down_revision: Union[str, Sequence[str], None] = 'a5e2b283f621'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('nota_fiscal_daily_totals',
+    sa.Column('cnpj_emitente', sa.String(length=18), nullable=False),
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('valor_total', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('icms', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('pis', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('cofins', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('desconto', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cnpj_emitente', 'dia', name='uq_nota_fiscal_daily_totals')
+    )
+    op.create_index(op.f('ix_nota_fiscal_daily_totals_dia'), 'nota_fiscal_daily_totals', ['dia'], unique=False)
+
+    # Carga inicial a partir das notas já existentes
+    op.execute(
+        """
+        INSERT INTO nota_fiscal_daily_totals
+            (cnpj_emitente, dia, quantidade, valor_total, icms, pis, cofins, desconto)
+        SELECT
+            cnpj_emitente,
+            CAST(created_at AS DATE),
+            count(*),
+            coalesce(sum(valor_total), 0),
+            coalesce(sum(icms), 0),
+            coalesce(sum(pis), 0),
+            coalesce(sum(cofins), 0),
+            coalesce(sum(desconto), 0)
+        FROM nota_fiscal
+        GROUP BY cnpj_emitente, CAST(created_at AS DATE)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_nota_fiscal_daily_totals_dia'), table_name='nota_fiscal_daily_totals')
+    op.drop_table('nota_fiscal_daily_totals')
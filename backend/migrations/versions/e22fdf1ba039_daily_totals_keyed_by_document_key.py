@@ -0,0 +1,42 @@
+"""Daily totals keyed by document key
+
+Revision ID: e22fdf1ba039
+Revises: c0dd58865e1b
+Create Date: 2026-10-18 12:04:41.421137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e22fdf1ba039'
+down_revision: Union[str, Sequence[str], None] = 'c0dd58865e1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Os totais diários passam a ser agrupados pelo CNPJ normalizado
+# (document_key): as linhas do mesmo emitente gravadas com e sem
+# pontuação são somadas em uma só
+MERGE_TOTALS = """
+WITH previous AS (
+    DELETE FROM nota_fiscal_daily_totals RETURNING *
+)
+INSERT INTO nota_fiscal_daily_totals (cnpj_emitente, dia, quantidade, valor_total, icms, pis, cofins, desconto, created_at, updated_at)
+SELECT upper(regexp_replace(cnpj_emitente, '[^0-9A-Za-z]', '', 'g')), dia, sum(quantidade), sum(valor_total), sum(icms), sum(pis), sum(cofins), sum(desconto), min(created_at), now()
+FROM previous
+GROUP BY 1, dia
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(MERGE_TOTALS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Os totais somados continuam corretos; para separá-los de novo pelo
+    # CNPJ gravado em cada nota, basta a tarefa recalculate_totals
+    pass
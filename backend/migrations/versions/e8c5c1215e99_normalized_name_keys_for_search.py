@@ -0,0 +1,46 @@
+"""Normalized name keys for search
+
+Revision ID: e8c5c1215e99
+Revises: 3f4a1e669cf2
+Create Date: 2026-10-18 11:38:23.799812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c5c1215e99'
+down_revision: Union[str, Sequence[str], None] = '3f4a1e669cf2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesma normalização de src/normalization.py (name_key)
+NAME_KEY = "btrim(regexp_replace(lower(translate(name, 'ÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝàáâãäåçèéêëìíîïñòóôõöùúûüýÿ', 'AAAAAACEEEEIIIINOOOOOUUUUYaaaaaaceeeeiiiinooooouuuuyy')), '[^0-9a-z]+', ' ', 'g'))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('emitentes', sa.Column('name_key', sa.String(length=100, collation='C'), sa.Computed(NAME_KEY, persisted=True), nullable=False))
+    op.add_column('destinatarios', sa.Column('name_key', sa.String(length=100, collation='C'), sa.Computed(NAME_KEY, persisted=True), nullable=False))
+
+    # A busca por nome passa a usar name_key, com a mesma correspondência
+    # do índice em memória
+    op.drop_index('ix_emitentes_name_trgm', table_name='emitentes')
+    op.drop_index('ix_destinatarios_name_trgm', table_name='destinatarios')
+    op.create_index('ix_emitentes_name_key_trgm', 'emitentes', ['name_key'], unique=False, postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'})
+    op.create_index('ix_destinatarios_name_key_trgm', 'destinatarios', ['name_key'], unique=False, postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_destinatarios_name_key_trgm', table_name='destinatarios')
+    op.drop_index('ix_emitentes_name_key_trgm', table_name='emitentes')
+    op.create_index('ix_emitentes_name_trgm', 'emitentes', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_destinatarios_name_trgm', 'destinatarios', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+    op.drop_column('destinatarios', 'name_key')
+    op.drop_column('emitentes', 'name_key')
@@ -1,9 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.routers import auth, destinatarios, emitentes, notas_fiscais, users
+from src.db.database import engine, replica_engine
+from src.db.read_your_writes import ReadYourWritesMiddleware
+from src.metrics import MetricsMiddleware, instrument_engine
+from src.routers import (
+    auth,
+    destinatarios,
+    emitentes,
+    jobs,
+    monitoring,
+    notas_fiscais,
+    users,
+)
+from src.search_index import maintain_search_indexes
+from src.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sem DDL aqui: as partições de nota_fiscal são criadas pelo
+    # entrypoint, antes dos workers, e mantidas pelo worker da fila
+    if not settings.SEARCH_INDEX_ENABLED:
+        yield
+        return
+
+    # Índice de autocomplete deste worker, carregado sem bloquear a subida
+    search_index_task = asyncio.create_task(maintain_search_indexes())
+    try:
+        yield
+    finally:
+        search_index_task.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# Latência por rota, consultas SQL por requisição e Server-Timing
+instrument_engine(engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine)
+    # Leituras do cliente no primário logo após as suas escritas
+    app.add_middleware(ReadYourWritesMiddleware, engine=engine)
+app.add_middleware(MetricsMiddleware)
 
 # Configuração CORS
 app.add_middleware(
@@ -25,3 +66,6 @@ app.include_router(auth.router)
 app.include_router(notas_fiscais.router)
 app.include_router(emitentes.router)
 app.include_router(destinatarios.router)
+app.include_router(jobs.router)
+app.include_router(monitoring.router)
+app.include_router(monitoring.metrics_router)
@@ -0,0 +1,65 @@
+"""
+GET condicional (ETag / If-None-Match) a partir de updated_at.
+
+As ETags são fracas (W/"..."): identificam a versão do registro, e não
+os bytes exatos da resposta. Quando o cliente envia uma ETag que ainda
+vale, a rota responde 304 sem serializar o corpo.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def entity_etag(entity) -> str:
+    """ETag de um registro: tabela, id e data da última alteração"""
+    return make_etag(entity.__tablename__, entity.id, entity.updated_at)
+
+
+def list_etag(name: str, count: int, last_modified: datetime | None) -> str:
+    """ETag de uma listagem: quantidade de linhas e maior updated_at"""
+    return make_etag(name, 'list', count, last_modified)
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict:
+    headers = {
+        'ETag': etag,
+        # Os dados exigem autenticação: o navegador guarda a resposta,
+        # mas revalida a cada uso
+        'Cache-Control': 'private, no-cache',
+    }
+    if last_modified is not None:
+        # As colunas de data não guardam fuso; são tratadas como UTC
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers['Last-Modified'] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparação fraca da ETag com as listadas em If-None-Match"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag.removeprefix('W/') in tags
+
+
+def not_modified(request: Request, headers: dict) -> Response | None:
+    """Resposta 304 quando a ETag de `headers` ainda vale para o cliente"""
+    if etag_matches(request, headers['ETag']):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return None
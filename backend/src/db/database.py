@@ -1,10 +1,91 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 
+from src.db.pool import InstrumentedQueuePool
+from src.db.read_your_writes import last_write_lsn, replayed, track_writes
 from src.settings import settings
 
-engine = create_async_engine(settings.database_url)
 
+def _connect_args() -> dict:
+    if 'asyncpg' not in settings.DATABASE_SCHEME:
+        return {}
+    return {
+        'prepared_statement_cache_size': (
+            settings.DATABASE_STATEMENT_CACHE_SIZE
+        )
+    }
 
-async def get_session():
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+engine = _create_engine(settings.database_url)
+
+# Réplica de leitura opcional, com um pool próprio do mesmo tamanho
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+
+def new_session() -> AsyncSession:
+    """
+    Cria uma sessão fora do ciclo de dependências do FastAPI,
+    usada por respostas em streaming que vivem além do handler
+    """
+    return AsyncSession(engine, expire_on_commit=False)
+
+
+def new_read_session() -> AsyncSession:
+    """
+    Sessão somente leitura na réplica (no primário quando não há
+    réplica); os dados podem estar alguns instantes atrasados
+    """
+    return AsyncSession(replica_engine or engine, expire_on_commit=False)
+
+
+async def get_session(request: Request):
+    async with new_session() as session:
+        if replica_engine is not None:
+            track_writes(session, request)
+        yield session
+
+
+async def get_read_session(request: Request):
+    """
+    Sessão para rotas de leitura: usa a réplica, exceto logo após uma
+    escrita do mesmo cliente que ela ainda não aplicou (ver
+    src/db/read_your_writes.py)
+    """
+    if replica_engine is not None:
+        lsn = last_write_lsn(request)
+        async with new_read_session() as session:
+            if lsn is None or await replayed(session, lsn):
+                yield session
+                return
+
+    async with new_session() as session:
         yield session
+
+
+def pool_stats() -> dict:
+    return engine.pool.stats()
+
+
+def replica_pool_stats() -> dict | None:
+    return replica_engine.pool.stats() if replica_engine else None
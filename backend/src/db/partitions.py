@@ -0,0 +1,162 @@
+"""
+Partições mensais da tabela nota_fiscal (PARTITION BY RANGE (created_at)).
+
+As partições do mês atual e dos próximos meses são criadas por este
+comando de manutenção, executado pelo entrypoint antes de subir a API
+(e que pode ser agendado), e periodicamente pelo worker da fila
+(src/jobs/worker.py):
+    python -m src.db.partitions --months-ahead 6
+
+A partição padrão recebe as linhas de meses que ainda não têm partição.
+Quando a partição de um desses meses é criada, as linhas dele são
+movidas da partição padrão para a nova partição.
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.db.database import engine
+from src.settings import settings
+
+PARENT_TABLE = 'nota_fiscal'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+# Chave do advisory lock que serializa a criação entre workers
+PARTITION_LOCK_KEY = 7_301_018
+
+
+def add_months(month: date, months: int) -> date:
+    """Primeiro dia do mês deslocado em `months` meses"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT_TABLE}_y{month.year}m{month.month:02d}'
+
+
+async def existing_partitions(connection: AsyncConnection) -> set[str]:
+    result = await connection.execute(
+        text(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = CAST(:parent AS regclass)'
+        ),
+        {'parent': PARENT_TABLE},
+    )
+    return set(result.scalars().all())
+
+
+async def _create_month_partition(
+    connection: AsyncConnection, month: date
+) -> str:
+    name = partition_name(month)
+    # Limites de DDL não aceitam parâmetros; são datas geradas aqui
+    bounds = f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+    in_range = {'start': month, 'end': add_months(month, 1)}
+
+    pending = await connection.scalar(
+        text(
+            f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} '
+            'WHERE created_at >= :start AND created_at < :end)'
+        ),
+        in_range,
+    )
+    if not pending:
+        await connection.execute(
+            text(f'CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}')
+        )
+        return name
+
+    # O mês já tem linhas na partição padrão: cria a tabela avulsa,
+    # move as linhas e só então a anexa como partição
+    await connection.execute(
+        text(
+            f'CREATE TABLE {name} '
+            f'(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+    )
+    await connection.execute(
+        text(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} '
+            'WHERE created_at >= :start AND created_at < :end RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved'
+        ),
+        in_range,
+    )
+    await connection.execute(
+        text(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bounds}')
+    )
+    return name
+
+
+async def ensure_partitions(
+    connection: AsyncConnection,
+    months_ahead: int = settings.NOTA_FISCAL_PARTITION_MONTHS_AHEAD,
+    start: date | None = None,
+) -> list[str]:
+    """
+    Cria a partição padrão e as partições mensais de `start` (padrão:
+    mês atual do banco) até `months_ahead` meses depois, caso ainda não
+    existam. Retorna os nomes das partições criadas.
+    """
+    await connection.execute(
+        text('SELECT pg_advisory_xact_lock(:key)'),
+        {'key': PARTITION_LOCK_KEY},
+    )
+    existing = await existing_partitions(connection)
+    created = []
+
+    if DEFAULT_PARTITION not in existing:
+        await connection.execute(
+            text(
+                f'CREATE TABLE {DEFAULT_PARTITION} '
+                f'PARTITION OF {PARENT_TABLE} DEFAULT'
+            )
+        )
+        created.append(DEFAULT_PARTITION)
+
+    if start is None:
+        start = await connection.scalar(select(func.current_date()))
+    first = start.replace(day=1)
+
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if partition_name(month) not in existing:
+            created.append(await _create_month_partition(connection, month))
+
+    return created
+
+
+async def _main(months_ahead: int, start: date | None):
+    try:
+        async with engine.begin() as connection:
+            created = await ensure_partitions(connection, months_ahead, start)
+    finally:
+        await engine.dispose()
+
+    for name in created:
+        print(f'Partição criada: {name}')
+    print(f'{len(created)} partições criadas')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Cria as partições mensais de nota_fiscal'
+    )
+    parser.add_argument(
+        '--months-ahead',
+        type=int,
+        default=settings.NOTA_FISCAL_PARTITION_MONTHS_AHEAD,
+    )
+    parser.add_argument(
+        '--from',
+        dest='start',
+        type=date.fromisoformat,
+        help='Primeiro mês (AAAA-MM-DD); padrão: mês atual',
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.months_ahead, args.start))
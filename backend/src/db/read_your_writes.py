@@ -0,0 +1,135 @@
+"""
+Leitura das próprias escritas com uma réplica assíncrona.
+
+A réplica aplica as alterações do primário com algum atraso. Depois de
+uma requisição que confirmou uma transação no primário (um commit na
+sessão de get_session), a resposta leva a posição do WAL do primário
+(pg_current_wal_lsn). Nas leituras seguintes do mesmo cliente, a réplica
+só é usada se já tiver aplicado essa posição (pg_last_wal_replay_lsn);
+caso contrário a leitura vai ao primário. A posição é lembrada por até
+DATABASE_READ_YOUR_WRITES_SECONDS. O login e as requisições rejeitadas
+não contam como escrita. O cliente é reconhecido de duas formas:
+
+- por um cookie com a posição, que vale em qualquer worker (e em
+  qualquer servidor) para clientes que guardam cookies (navegadores,
+  sessões HTTP);
+- pelo cabeçalho Authorization, lembrado em memória apenas pelo worker
+  que atendeu a escrita. Um cliente que não guarda cookies e cuja
+  leitura cai em outro worker pode ler da réplica um dado anterior à
+  sua escrita.
+"""
+
+import hashlib
+import re
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from src.cache import TTLCache
+from src.settings import settings
+
+COOKIE_NAME = 'nfse_last_write'
+# Chave no estado da requisição (scope['state']) e no info da sessão
+STATE_KEY = 'read_your_writes'
+
+_LSN = re.compile(r'[0-9A-F]{1,8}/[0-9A-F]{1,8}')
+
+_recent_writers = TTLCache(
+    maxsize=settings.DATABASE_READ_YOUR_WRITES_MAX_CLIENTS,
+    ttl=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+)
+
+
+def _client_key(authorization: bytes | str | None) -> str | None:
+    if not authorization:
+        return None
+    if isinstance(authorization, str):
+        authorization = authorization.encode()
+    # Guarda apenas o hash da credencial
+    return hashlib.blake2b(authorization, digest_size=16).hexdigest()
+
+
+def track_writes(session: AsyncSession, request: Request):
+    """Marca a requisição quando a sessão confirmar uma transação"""
+    session.info[STATE_KEY] = request.scope.setdefault('state', {})
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session: Session):
+    state = session.info.get(STATE_KEY)
+    if state is not None:
+        state[STATE_KEY] = True
+
+
+def last_write_lsn(request: Request) -> str | None:
+    """Posição do WAL da última escrita do cliente, dentro da janela"""
+    lsn = request.cookies.get(COOKIE_NAME, '')
+    if _LSN.fullmatch(lsn):
+        return lsn
+
+    key = _client_key(request.headers.get('authorization'))
+    return _recent_writers.get(key) if key is not None else None
+
+
+async def replayed(session: AsyncSession, lsn: str) -> bool:
+    """Se a réplica da sessão já aplicou o WAL até `lsn`"""
+    return bool(
+        await session.scalar(
+            text(
+                'SELECT coalesce(pg_last_wal_replay_lsn() >= '
+                'CAST(CAST(:lsn AS text) AS pg_lsn), false)'
+            ),
+            {'lsn': lsn},
+        )
+    )
+
+
+async def _mark_write(scope, engine: AsyncEngine) -> bytes:
+    # Lida depois do commit, a posição atual cobre a escrita
+    async with engine.connect() as connection:
+        lsn = await connection.scalar(
+            text('SELECT CAST(pg_current_wal_lsn() AS text)')
+        )
+
+    key = _client_key(dict(scope['headers']).get(b'authorization'))
+    if key is not None:
+        _recent_writers.set(key, lsn)
+
+    window = int(settings.DATABASE_READ_YOUR_WRITES_SECONDS) + 1
+    return (
+        f'{COOKIE_NAME}={lsn}; Max-Age={window}; '
+        'Path=/; HttpOnly; SameSite=Lax'
+    ).encode()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que informa a posição do WAL do primário nas
+    respostas às escritas de cada cliente
+    """
+
+    def __init__(self, app, engine: AsyncEngine):
+        self.app = app
+        self.engine = engine
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marking_writes(message):
+            wrote = scope.get('state', {}).get(STATE_KEY)
+            if wrote and message['type'] == 'http.response.start':
+                cookie = await _mark_write(scope, self.engine)
+                message = {
+                    **message,
+                    'headers': [
+                        *message.get('headers', []),
+                        (b'set-cookie', cookie),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writes)
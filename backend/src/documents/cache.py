@@ -0,0 +1,101 @@
+"""
+Cache em disco dos PDFs gerados, endereçado pelo conteúdo.
+
+A chave é o hash do id da nota, do updated_at e da versão do layout:
+qualquer alteração na nota (ou no layout) gera uma chave nova, então
+um arquivo em cache nunca precisa ser invalidado, e a própria chave
+serve de ETag. Versões antigas apenas deixam de ser lidas e podem ser
+apagadas a qualquer momento: o worker da fila (src/jobs/worker.py)
+chama prune periodicamente para manter o diretório dentro de
+DANFE_CACHE_MAX_SIZE_MB, apagando primeiro os arquivos usados há mais
+tempo.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.settings import settings
+
+# Incrementar ao mudar o desenho de src/documents/danfe.py
+DANFE_LAYOUT_VERSION = 1
+# Arquivos temporários mais antigos que isso sobraram de uma gravação
+# interrompida e podem ser apagados
+TEMPORARY_MAX_AGE_SECONDS = 3600
+
+
+class PdfCache:
+    def __init__(self, directory: str, version: int):
+        self.directory = Path(directory)
+        self.version = version
+
+    def key(self, nota_id: int, updated_at: datetime) -> str:
+        source = f'{self.version}:{nota_id}:{updated_at.isoformat()}'
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        # Subdiretórios pelos dois primeiros caracteres, para não
+        # acumular milhares de arquivos em um único diretório
+        return self.directory / key[:2] / f'{key}.pdf'
+
+    def get(self, key: str) -> Path | None:
+        path = self.path(key)
+        try:
+            # Atualiza o mtime: prune apaga os menos usados primeiro
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, content: bytes) -> Path:
+        """
+        Grava em um arquivo temporário e renomeia: leitores concorrentes
+        nunca veem um PDF pela metade, e duas gravações da mesma chave
+        produzem o mesmo conteúdo
+        """
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                target.write(content)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return path
+
+    def prune(self, max_bytes: int) -> int:
+        """
+        Apaga os PDFs usados há mais tempo (pelo mtime) até que o
+        diretório ocupe no máximo `max_bytes`, além dos temporários
+        abandonados. Retorna a quantidade de arquivos apagados.
+        """
+        files, total = [], 0
+        expired = time.time() - TEMPORARY_MAX_AGE_SECONDS
+        for path in self.directory.glob('*/*'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == '.pdf':
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            elif path.suffix == '.tmp' and stat.st_mtime < expired:
+                files.append((0, 0, path))
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if size and total <= max_bytes:
+                break
+            # Outro processo pode ter apagado o arquivo antes
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+danfe_cache = PdfCache(settings.DANFE_CACHE_DIR, DANFE_LAYOUT_VERSION)
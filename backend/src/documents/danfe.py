@@ -0,0 +1,264 @@
+"""
+DANFE simplificado (Documento Auxiliar da NF-e) em PDF.
+
+O desenho fixo (quadros, rótulos, títulos) e as métricas das fontes
+são compilados uma única vez por processo em danfe_template(); cada
+nota acrescenta apenas os seus valores. Os PDFs são gravados no cache
+em disco (src/documents/cache.py) e os lotes são distribuídos entre os
+processos de um pool.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from functools import cache
+from typing import Any
+
+from src.documents.cache import danfe_cache
+from src.documents.pdf import (
+    HELVETICA,
+    HELVETICA_BOLD,
+    PageTemplate,
+    TextStyle,
+    fill_rect,
+    rect,
+    text,
+)
+from src.models.notaFiscal_model import NotaFiscal
+from src.settings import settings
+from src.validators.document_validator import normalize_document
+
+# Campos da nota usados no DANFE, enviados aos processos do pool
+NOTA_FIELDS = (
+    'id',
+    'created_at',
+    'updated_at',
+    'numero_nota',
+    'serie',
+    'cfop',
+    'nome_emitente',
+    'cnpj_emitente',
+    'nome_destinatario',
+    'cpf_ou_cnpj_destinatario',
+    'valor_total',
+    'icms',
+    'pis',
+    'cofins',
+    'desconto',
+)
+
+# A4 em pontos; as posições abaixo são medidas a partir do topo
+PAGE_HEIGHT = 842
+MARGIN = 28
+CONTENT_WIDTH = 539
+TAX_BOX_WIDTH = CONTENT_WIDTH / 5
+
+CPF_LENGTH = 11
+CNPJ_LENGTH = 14
+
+LABEL = TextStyle(HELVETICA, 6)
+HEADING = TextStyle(HELVETICA_BOLD, 7)
+VALUE = TextStyle(HELVETICA, 9)
+MONEY = TextStyle(HELVETICA, 9, 'right')
+SUBTITLE = TextStyle(HELVETICA, 7, 'center')
+
+# Quadros com rótulo: (rótulo, x, topo, largura, altura)
+BOXES = (
+    ('EMITENTE', MARGIN, 28, 359, 72),
+    ('', 387, 28, 180, 72),
+    ('CFOP', MARGIN, 106, 120, 28),
+    ('DATA DE EMISSÃO', 148, 106, 140, 28),
+    ('IDENTIFICADOR NO SISTEMA', 288, 106, 279, 28),
+    ('NOME / RAZÃO SOCIAL', MARGIN, 150, 389, 28),
+    ('CNPJ / CPF', 417, 150, 150, 28),
+    *(
+        (label, MARGIN + index * TAX_BOX_WIDTH, 194, TAX_BOX_WIDTH, 28)
+        for index, label in enumerate((
+            'VALOR DO ICMS',
+            'VALOR DO PIS',
+            'VALOR DA COFINS',
+            'DESCONTO',
+            'VALOR TOTAL DA NOTA',
+        ))
+    ),
+)
+
+# Textos fixos: (texto, x, linha de base, largura, estilo)
+STATIC_TEXTS = (
+    ('DANFE', 387, 48, 180, TextStyle(HELVETICA_BOLD, 14, 'center')),
+    ('Documento Auxiliar da', 387, 60, 180, SUBTITLE),
+    ('Nota Fiscal Eletrônica', 387, 69, 180, SUBTITLE),
+    ('DESTINATÁRIO', MARGIN, 146, CONTENT_WIDTH, HEADING),
+    ('CÁLCULO DO IMPOSTO', MARGIN, 190, CONTENT_WIDTH, HEADING),
+    (
+        'Representação simplificada gerada a partir dos dados '
+        'registrados no sistema; não substitui o DANFE oficial.',
+        MARGIN,
+        236,
+        CONTENT_WIDTH,
+        LABEL,
+    ),
+)
+
+# Valores da nota: campo -> (x, linha de base, largura, estilo)
+SLOTS = {
+    'nome_emitente': (32, 52, 351, TextStyle(HELVETICA_BOLD, 11)),
+    'cnpj_emitente': (32, 68, 351, VALUE),
+    'numero_nota': (391, 84, 172, TextStyle(HELVETICA_BOLD, 9, 'center')),
+    'serie': (391, 94, 172, TextStyle(HELVETICA, 8, 'center')),
+    'cfop': (32, 128, 112, VALUE),
+    'created_at': (152, 128, 132, VALUE),
+    'id': (292, 128, 271, VALUE),
+    'nome_destinatario': (32, 172, 381, VALUE),
+    'cpf_ou_cnpj_destinatario': (421, 172, 142, VALUE),
+    **{
+        field: (
+            MARGIN + index * TAX_BOX_WIDTH + 4,
+            216,
+            TAX_BOX_WIDTH - 8,
+            MONEY,
+        )
+        for index, field in enumerate((
+            'icms',
+            'pis',
+            'cofins',
+            'desconto',
+            'valor_total',
+        ))
+    },
+}
+
+
+def _y(top: float, height: float = 0) -> float:
+    return PAGE_HEIGHT - top - height
+
+
+def _money(value: Decimal | None) -> str:
+    # 1234.5 -> 1.234,50
+    formatted = f'{value or 0:,.2f}'
+    return formatted.translate(str.maketrans(',.', '.,'))
+
+
+def _document(document: str) -> str:
+    document = normalize_document(document)
+    if len(document) == CNPJ_LENGTH:
+        return (
+            f'{document[:2]}.{document[2:5]}.{document[5:8]}/'
+            f'{document[8:12]}-{document[12:]}'
+        )
+    if len(document) == CPF_LENGTH:
+        return f'{document[:3]}.{document[3:6]}.{document[6:9]}-{document[9:]}'
+    return document
+
+
+def _values(nota: dict[str, Any]) -> dict[str, str]:
+    created_at: datetime = nota['created_at']
+    values = {
+        'nome_emitente': nota['nome_emitente'],
+        'cnpj_emitente': f'CNPJ / CPF: {_document(nota["cnpj_emitente"])}',
+        'numero_nota': f'Nº {nota["numero_nota"]}',
+        'serie': f'SÉRIE {nota["serie"]}',
+        'cfop': nota['cfop'],
+        'created_at': created_at.strftime('%d/%m/%Y %H:%M:%S'),
+        'id': str(nota['id']),
+        'nome_destinatario': nota['nome_destinatario'],
+        'cpf_ou_cnpj_destinatario': _document(
+            nota['cpf_ou_cnpj_destinatario']
+        ),
+    }
+    for field in ('icms', 'pis', 'cofins', 'desconto', 'valor_total'):
+        values[field] = _money(nota[field])
+    return values
+
+
+@cache
+def danfe_template() -> PageTemplate:
+    """Parte fixa do DANFE, compilada no primeiro uso de cada processo"""
+    static = [
+        # Fundo do quadro do valor total
+        fill_rect(
+            MARGIN + 4 * TAX_BOX_WIDTH, _y(194, 28), TAX_BOX_WIDTH, 28, 0.92
+        )
+    ]
+    for label, x, top, width, height in BOXES:
+        static.append(rect(x, _y(top, height), width, height))
+        if label:
+            static.append(text(x + 3, _y(top + 8), label, LABEL))
+    for value, x, baseline, width, style in STATIC_TEXTS:
+        static.append(text(x, _y(baseline), value, style, width))
+    return PageTemplate(b''.join(static))
+
+
+def nota_snapshot(nota: NotaFiscal) -> dict[str, Any]:
+    """Campos da nota em um dicionário serializável para o pool"""
+    return {field: getattr(nota, field) for field in NOTA_FIELDS}
+
+
+def render_danfe(nota: dict[str, Any]) -> bytes:
+    values = _values(nota)
+    content = b''.join(
+        text(x, _y(baseline), values[field], style, width)
+        for field, (x, baseline, width, style) in SLOTS.items()
+    )
+    return danfe_template().render(content)
+
+
+def render_to_cache(notas: list[dict[str, Any]]) -> list[str]:
+    """
+    Gera os DANFEs e os grava no cache, retornando as chaves. Executada
+    nos processos do pool, por isso recebe e devolve apenas dados
+    serializáveis e não devolve os PDFs.
+    """
+    keys = []
+    for nota in notas:
+        key = danfe_cache.key(nota['id'], nota['updated_at'])
+        danfe_cache.put(key, render_danfe(nota))
+        keys.append(key)
+    return keys
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    # Cada worker da API tem o seu pool: por padrão eles dividem os
+    # núcleos, em vez de cada um abrir um processo por núcleo
+    workers = settings.DANFE_WORKERS or max(
+        1, (os.cpu_count() or 1) // settings.server_workers
+    )
+    # spawn evita herdar threads e conexões do processo da API via fork
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+
+
+@cache
+def get_process_pool() -> ProcessPoolExecutor:
+    """Pool compartilhado pelas gerações em lote feitas pela API"""
+    return create_process_pool()
+
+
+async def render_many(
+    notas: list[dict[str, Any]],
+    chunk_size: int = settings.DANFE_BATCH_CHUNK_SIZE,
+) -> list[str]:
+    """
+    Gera os DANFEs em pedaços de `chunk_size` notas, distribuídos entre
+    os processos do pool. Até um pedaço é gerado em uma thread: o custo
+    de enviar a tarefa ao pool seria maior que o da geração.
+    """
+    if len(notas) <= chunk_size:
+        return await asyncio.to_thread(render_to_cache, notas)
+
+    loop = asyncio.get_running_loop()
+    executor = get_process_pool()
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor, render_to_cache, notas[start : start + chunk_size]
+            )
+            for start in range(0, len(notas), chunk_size)
+        )
+    )
+    return [key for chunk in chunks for key in chunk]
@@ -0,0 +1,217 @@
+"""
+Geração mínima de PDF de uma página com as fontes padrão Helvetica.
+
+As fontes padrão fazem parte de todo leitor de PDF e não precisam ser
+embutidas: basta a tabela de larguras (métricas AFM) para medir,
+alinhar e truncar os textos. PageTemplate compila uma única vez a
+parte fixa do documento (objetos, fontes e o desenho estático já
+comprimido); cada página renderizada acrescenta apenas o stream com os
+valores variáveis, a tabela xref e o trailer.
+"""
+
+import unicodedata
+import zlib
+from typing import NamedTuple
+
+# Larguras (1/1000 do corpo) dos caracteres ASCII 32-126, na ordem
+_HELVETICA_WIDTHS = (
+    '278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 '
+    '556 556 556 556 556 556 556 556 556 556 278 278 584 584 584 556 '
+    '1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 '
+    '667 778 722 667 611 722 667 944 667 667 611 278 278 278 469 556 '
+    '333 556 556 500 556 556 278 556 556 222 222 500 222 833 556 556 '
+    '556 556 333 500 278 556 500 722 500 500 500 334 260 334 584'
+)
+_HELVETICA_BOLD_WIDTHS = (
+    '278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 '
+    '556 556 556 556 556 556 556 556 556 556 333 333 584 584 584 611 '
+    '975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 '
+    '667 778 722 667 611 722 667 944 667 667 611 333 278 333 584 556 '
+    '333 556 611 556 611 556 333 611 611 278 278 556 278 889 611 611 '
+    '611 611 389 556 333 611 556 778 556 556 500 389 280 389 584'
+)
+# Caracteres fora do ASCII que aparecem nos textos, com largura própria
+_EXTRA_WIDTHS = {'…': 1000, 'º': 365, 'ª': 370, '°': 400}
+
+ELLIPSIS = '…'
+
+
+def _width_table(ascii_widths: str) -> dict[str, int]:
+    widths = {
+        chr(code): int(width)
+        for code, width in enumerate(ascii_widths.split(), start=32)
+    }
+    # Letras acentuadas do WinAnsi têm a largura da letra base
+    for code in range(0xC0, 0x100):
+        char = chr(code)
+        base = unicodedata.normalize('NFD', char)[0]
+        if base in widths:
+            widths[char] = widths[base]
+    return {**widths, **_EXTRA_WIDTHS}
+
+
+class Font(NamedTuple):
+    resource: str
+    base_font: str
+    widths: dict[str, int]
+
+    def width(self, text: str, size: float) -> float:
+        # Caracteres sem métrica saem como '?' (ver encode_text)
+        total = sum(self.widths.get(char, 556) for char in text)
+        return total * size / 1000
+
+    def fit(self, text: str, size: float, max_width: float) -> str:
+        """Trunca o texto com reticências para caber em max_width"""
+        if self.width(text, size) <= max_width:
+            return text
+        while text and self.width(text + ELLIPSIS, size) > max_width:
+            text = text[:-1]
+        return text.rstrip() + ELLIPSIS
+
+
+HELVETICA = Font('F1', 'Helvetica', _width_table(_HELVETICA_WIDTHS))
+HELVETICA_BOLD = Font(
+    'F2', 'Helvetica-Bold', _width_table(_HELVETICA_BOLD_WIDTHS)
+)
+FONTS = (HELVETICA, HELVETICA_BOLD)
+
+
+def encode_text(text: str) -> bytes:
+    """String literal do PDF em WinAnsiEncoding, com os escapes"""
+    encoded = text.encode('cp1252', errors='replace')
+    return (
+        encoded.replace(b'\\', b'\\\\')
+        .replace(b'(', b'\\(')
+        .replace(b')', b'\\)')
+    )
+
+
+def _number(value: float) -> str:
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def rect(x: float, y: float, width: float, height: float) -> bytes:
+    return (
+        f'{_number(x)} {_number(y)} {_number(width)} {_number(height)} re S\n'
+    ).encode()
+
+
+def fill_rect(
+    x: float, y: float, width: float, height: float, gray: float
+) -> bytes:
+    return (
+        f'q {_number(gray)} g {_number(x)} {_number(y)} '
+        f'{_number(width)} {_number(height)} re f Q\n'
+    ).encode()
+
+
+class TextStyle(NamedTuple):
+    font: Font
+    size: float
+    # left, center ou right; vale apenas para textos com largura
+    align: str = 'left'
+
+
+def text(
+    x: float,
+    y: float,
+    value: str,
+    style: TextStyle,
+    width: float | None = None,
+) -> bytes:
+    """
+    Texto com a linha de base em y. Com `width`, o texto é truncado
+    para caber na largura e alinhado conforme o estilo.
+    """
+    font, size = style.font, style.size
+    if width is not None:
+        value = font.fit(value, size, width)
+        free = width - font.width(value, size)
+        if style.align == 'right':
+            x += free
+        elif style.align == 'center':
+            x += free / 2
+    return (
+        f'BT /{font.resource} {_number(size)} Tf '
+        f'{_number(x)} {_number(y)} Td ('.encode()
+        + encode_text(value)
+        + b') Tj ET\n'
+    )
+
+
+def _stream_object(number: int, content: bytes) -> bytes:
+    compressed = zlib.compress(content)
+    return (
+        f'{number} 0 obj\n<< /Length {len(compressed)} '
+        '/Filter /FlateDecode >>\nstream\n'.encode()
+        + compressed
+        + b'\nendstream\nendobj\n'
+    )
+
+
+class PageTemplate:
+    """
+    Documento de uma página: `static` é desenhado em toda página e o
+    conteúdo passado a render() é desenhado por cima
+    """
+
+    def __init__(self, static: bytes, width: float = 595, height: float = 842):
+        self.width = width
+        self.height = height
+
+        font_refs = ' '.join(
+            f'/{font.resource} {number} 0 R'
+            for number, font in enumerate(FONTS, start=4)
+        )
+        static_number = 4 + len(FONTS)
+        # O stream variável é sempre o último objeto: as posições de
+        # todos os anteriores são fixas e ficam pré-calculadas
+        self._dynamic_number = static_number + 1
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+            (
+                f'<< /Type /Page /Parent 2 0 R '
+                f'/MediaBox [0 0 {_number(width)} {_number(height)}] '
+                f'/Resources << /Font << {font_refs} >> >> '
+                f'/Contents [{static_number} 0 R '
+                f'{self._dynamic_number} 0 R] >>'
+            ).encode(),
+            *(
+                (
+                    f'<< /Type /Font /Subtype /Type1 '
+                    f'/BaseFont /{font.base_font} '
+                    '/Encoding /WinAnsiEncoding >>'
+                ).encode()
+                for font in FONTS
+            ),
+        ]
+
+        prefix = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(prefix))
+            prefix += f'{number} 0 obj\n'.encode() + body + b'\nendobj\n'
+        offsets.append(len(prefix))
+        prefix += _stream_object(static_number, static)
+
+        self._prefix = bytes(prefix)
+        self._xref = b''.join(
+            f'{offset:010d} 00000 n \n'.encode() for offset in offsets
+        )
+
+    def render(self, content: bytes) -> bytes:
+        dynamic = _stream_object(self._dynamic_number, content)
+        xref_offset = len(self._prefix) + len(dynamic)
+        size = self._dynamic_number + 1
+        return b''.join((
+            self._prefix,
+            dynamic,
+            f'xref\n0 {size}\n0000000000 65535 f \n'.encode(),
+            self._xref,
+            f'{len(self._prefix):010d} 00000 n \n'.encode(),
+            (
+                f'trailer\n<< /Size {size} /Root 1 0 R >>\n'
+                f'startxref\n{xref_offset}\n%%EOF\n'
+            ).encode(),
+        ))
@@ -0,0 +1,336 @@
+"""
+Importação de NF-e a partir de arquivos XML (ou ZIPs com vários XMLs).
+
+O XML é lido de forma incremental (iterparse), sem montar o DOM
+completo: cada <infNFe> é convertido em um dicionário compatível com
+NotaFiscalCreate e descartado da árvore logo em seguida. Os processos
+do pool enviam as notas em blocos de até IMPORT_BATCH_SIZE por uma fila
+limitada, e cada bloco é gravado assim que chega: mesmo um único XML
+grande ocupa uma quantidade constante de memória.
+
+Uso pela linha de comando (a partir de backend/):
+    python -m src.importers.nfe_xml notas.zip outra_nota.xml
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from decimal import Decimal
+from functools import cache
+from multiprocessing.managers import SyncManager
+from xml.etree.ElementTree import Element, ParseError, iterparse
+
+from pydantic import ValidationError
+
+from src.db.database import engine, new_session
+from src.repositories.nota_fiscal_repository import NotaFiscalRepository
+from src.schemas.nota_fiscal_schema import NotaFiscalCreate
+from src.settings import settings
+
+# Blocos de notas aguardando gravação por importação; com a fila cheia,
+# os processos do pool esperam antes de continuar a leitura
+RESULT_QUEUE_SIZE = 4
+# Intervalo para conferir se algum processo do pool falhou enquanto a
+# importação espera o próximo bloco
+RESULT_POLL_SECONDS = 1
+
+# Campos do grupo <ICMSTot> mapeados para a nota fiscal
+TOTAL_FIELDS = {
+    'valor_total': 'vNF',
+    'icms': 'vICMS',
+    'pis': 'vPIS',
+    'cofins': 'vCOFINS',
+    'desconto': 'vDesc',
+}
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _find(element: Element | None, path: str) -> Element | None:
+    """Navega por nomes locais, ignorando o namespace da NF-e"""
+    for name in path.split('/'):
+        if element is None:
+            return None
+        element = next(
+            (child for child in element if _local_name(child.tag) == name),
+            None,
+        )
+    return element
+
+
+def _text(element: Element | None, path: str) -> str | None:
+    found = _find(element, path)
+    if found is None or found.text is None:
+        return None
+    return found.text.strip()
+
+
+def _document(party: Element | None) -> str | None:
+    if party is None:
+        return None
+    for tag in ('CNPJ', 'CPF', 'idEstrangeiro'):
+        value = _text(party, tag)
+        if value:
+            return value
+    return None
+
+
+def map_inf_nfe(inf_nfe: Element) -> dict:
+    """Converte um elemento <infNFe> nos campos de NotaFiscalCreate"""
+    emit = _find(inf_nfe, 'emit')
+    dest = _find(inf_nfe, 'dest')
+    # O CFOP é informado por item; a nota usa o do primeiro item
+    first_item = _find(inf_nfe, 'det')
+
+    nota = {
+        'numero_nota': _text(inf_nfe, 'ide/nNF'),
+        'serie': _text(inf_nfe, 'ide/serie'),
+        'cfop': _text(first_item, 'prod/CFOP'),
+        'nome_emitente': _text(emit, 'xNome'),
+        'cnpj_emitente': _document(emit),
+        'nome_destinatario': _text(dest, 'xNome'),
+        'cpf_ou_cnpj_destinatario': _document(dest),
+    }
+
+    for field, tag in TOTAL_FIELDS.items():
+        value = _text(inf_nfe, f'total/ICMSTot/{tag}')
+        nota[field] = Decimal(value) if value else None
+
+    return nota
+
+
+def iter_nfe_xml(
+    stream, chunk_size: int
+) -> Iterator[tuple[list[dict], list[str]]]:
+    """
+    Lê um XML de NF-e (nota única, nfeProc ou lote) incrementalmente.
+    Gera blocos com até `chunk_size` notas válidas e as mensagens de
+    erro das inválidas lidas desde o bloco anterior.
+    """
+    notas, errors = [], []
+    root = None
+
+    for event, element in iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = element
+        if event != 'end' or _local_name(element.tag) != 'infNFe':
+            continue
+
+        nota_id = element.get('Id', 'infNFe')
+        try:
+            nota = NotaFiscalCreate.model_validate(map_inf_nfe(element))
+            notas.append(nota.model_dump())
+        except (ValidationError, ArithmeticError) as exc:
+            errors.append(f'{nota_id}: {exc}')
+
+        # Libera o que já foi lido para manter a memória constante
+        root.clear()
+
+        if len(notas) >= chunk_size:
+            yield notas, errors
+            notas, errors = [], []
+
+    if notas or errors:
+        yield notas, errors
+
+
+def parse_nfe_xml(stream) -> tuple[list[dict], list[str]]:
+    """Todas as notas válidas do XML e as mensagens de erro"""
+    notas, errors = [], []
+    for chunk_notas, chunk_errors in iter_nfe_xml(stream, chunk_size=1000):
+        notas.extend(chunk_notas)
+        errors.extend(chunk_errors)
+    return notas, errors
+
+
+def list_sources(path: str) -> list[tuple[str, str | None]]:
+    """Lista os XMLs de um arquivo: o próprio XML ou os membros do ZIP"""
+    if not zipfile.is_zipfile(path):
+        return [(path, None)]
+
+    with zipfile.ZipFile(path) as archive:
+        return [
+            (path, member)
+            for member in archive.namelist()
+            if member.lower().endswith('.xml')
+        ]
+
+
+def _parse_chunks(path: str, member: str | None, chunk_size: int):
+    if member is None:
+        with open(path, 'rb') as stream:
+            yield from iter_nfe_xml(stream, chunk_size)
+    else:
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(member) as stream:
+                yield from iter_nfe_xml(stream, chunk_size)
+
+
+def parse_source(
+    path: str, member: str | None, results, stop, chunk_size: int
+) -> None:
+    """
+    Processa um XML avulso ou um membro de ZIP, colocando em `results`
+    (fila do SyncManager) um bloco por vez. Executada nos processos do
+    pool, por isso recebe e envia apenas dados serializáveis. O último
+    bloco de cada arquivo tem 'done'. Quando `stop` (Event do
+    SyncManager) é sinalizado, a leitura para sem esperar vaga na fila.
+    """
+    source = f'{os.path.basename(path)}:{member}' if member else path
+
+    def put(notas: list[dict], errors: list[str], done: bool = False):
+        """Envia um bloco; False quando a importação foi interrompida"""
+        block = {
+            'source': source,
+            'notas': notas,
+            'errors': [{'source': source, 'error': e} for e in errors],
+            'done': done,
+        }
+        while not stop.is_set():
+            try:
+                results.put(block, timeout=RESULT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for notas, errors in _parse_chunks(path, member, chunk_size):
+            if not put(notas, errors):
+                return
+    except (OSError, ParseError, zipfile.BadZipFile) as exc:
+        put([], [str(exc)])
+    finally:
+        put([], [], done=True)
+
+
+def create_process_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    if workers is None:
+        # Cada worker da API tem o seu pool: por padrão eles dividem os
+        # núcleos, em vez de cada um abrir um processo por núcleo
+        workers = settings.IMPORT_WORKERS or max(
+            1, (os.cpu_count() or 1) // settings.server_workers
+        )
+    # spawn evita herdar threads e conexões do processo da API via fork
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+
+
+def create_manager() -> SyncManager:
+    """Processo que mantém as filas de blocos entre o pool e a API"""
+    return multiprocessing.get_context('spawn').Manager()
+
+
+@cache
+def get_process_pool() -> ProcessPoolExecutor:
+    """Pool compartilhado pelas importações feitas através da API"""
+    return create_process_pool()
+
+
+@cache
+def get_manager() -> SyncManager:
+    """Manager compartilhado pelas importações feitas através da API"""
+    return create_manager()
+
+
+async def _next_result(results, tasks: list[asyncio.Future]) -> dict:
+    """
+    Próximo bloco da fila, sem bloquear o event loop; levanta a exceção
+    de um processo do pool que falhou sem enviar o seu último bloco
+    """
+    while True:
+        try:
+            return await asyncio.to_thread(
+                results.get, timeout=RESULT_POLL_SECONDS
+            )
+        except queue.Empty:
+            for task in tasks:
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+
+
+async def import_nfe_files(
+    paths: list[str],
+    repo: NotaFiscalRepository,
+    executor: Executor,
+    manager: SyncManager,
+    batch_size: int = settings.IMPORT_BATCH_SIZE,
+) -> dict:
+    """
+    Processa os arquivos no pool e grava cada bloco de até `batch_size`
+    notas pelo NotaFiscalRepository.create_many, assim que ele chega.
+    """
+    loop = asyncio.get_running_loop()
+    sources = [source for path in paths for source in list_sources(path)]
+    results = manager.Queue(maxsize=RESULT_QUEUE_SIZE)
+    stop = manager.Event()
+    tasks = [
+        loop.run_in_executor(
+            executor, parse_source, path, member, results, stop, batch_size
+        )
+        for path, member in sources
+    ]
+
+    imported, errors, remaining = 0, [], len(tasks)
+    try:
+        while remaining:
+            result = await _next_result(results, tasks)
+            errors.extend(result['errors'])
+            if result['notas']:
+                imported += len(await repo.create_many(result['notas']))
+            remaining -= result['done']
+    finally:
+        # Se a gravação ou um processo falhar, ninguém mais lê a fila: os
+        # processos em andamento param em vez de esperar por uma vaga, e
+        # os arquivos que ainda não começaram saem da fila do pool
+        stop.set()
+        for task in tasks:
+            task.cancel()
+
+    return {'files': len(sources), 'imported': imported, 'errors': errors}
+
+
+async def _main(paths: list[str], batch_size: int):
+    try:
+        # Fora da API, a importação usa todos os núcleos
+        workers = settings.IMPORT_WORKERS or os.cpu_count()
+        with (
+            create_process_pool(workers) as executor,
+            create_manager() as manager,
+        ):
+            async with new_session() as session:
+                summary = await import_nfe_files(
+                    paths,
+                    NotaFiscalRepository(session),
+                    executor,
+                    manager,
+                    batch_size,
+                )
+    finally:
+        await engine.dispose()
+
+    for error in summary['errors']:
+        print(f'⚠️ {error["source"]}: {error["error"]}')
+    print(
+        f'{summary["imported"]} notas importadas de '
+        f'{summary["files"]} arquivos XML'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Importa XMLs de NF-e')
+    parser.add_argument('paths', nargs='+', help='Arquivos XML ou ZIP')
+    parser.add_argument(
+        '--batch-size', type=int, default=settings.IMPORT_BATCH_SIZE
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.paths, args.batch_size))
@@ -0,0 +1,103 @@
+"""
+Tarefas executadas pela fila em segundo plano (src/jobs/worker.py).
+
+Cada tipo de tarefa registra a função assíncrona que a executa e o
+schema do seu payload: a API valida o payload ao receber a tarefa e o
+worker o valida de novo antes de chamar a função. As funções rodam nos
+processos do pool do worker, com sessões próprias, e retornam um
+dicionário serializável em JSON, gravado como resultado da tarefa.
+"""
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from datetime import datetime, time, timedelta
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel
+
+from src.db.database import new_session
+from src.models.notaFiscal_model import NotaFiscal
+from src.repositories.nota_fiscal_repository import (
+    STREAM_CHUNK_SIZE,
+    NotaFiscalRepository,
+)
+from src.schemas.job_schema import DateRangePayload
+from src.validators.document_validator import validate_documents
+
+# Notas inválidas listadas no resultado da revalidação
+MAX_REPORTED_INVALID = 1000
+# Campos de documento conferidos pela revalidação
+DOCUMENT_FIELDS = ('cnpj_emitente', 'cpf_ou_cnpj_destinatario')
+
+
+class JobHandler(NamedTuple):
+    func: Callable[[Any], Awaitable[dict[str, Any]]]
+    payload_schema: type[BaseModel]
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, payload_schema: type[BaseModel]):
+    def register(func):
+        JOB_HANDLERS[kind] = JobHandler(func, payload_schema)
+        return func
+
+    return register
+
+
+@job_handler('recalculate_totals', DateRangePayload)
+async def recalculate_totals(payload: DateRangePayload) -> dict[str, Any]:
+    """Reconstrói os totais diários do período a partir das notas"""
+    async with new_session() as session:
+        rows = await NotaFiscalRepository(session).rebuild_totals(
+            payload.start_date, payload.end_date + timedelta(days=1)
+        )
+    return {'daily_totals': rows}
+
+
+async def _chunks(items: AsyncIterator, size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _invalid_documents(notas: list[NotaFiscal]) -> Iterator[dict[str, Any]]:
+    """
+    Documentos inválidos de um bloco de notas; cada coluna é conferida
+    de uma vez por validate_documents, já que as notas repetem os mesmos
+    emitentes e destinatários
+    """
+    for field in DOCUMENT_FIELDS:
+        values = [getattr(nota, field) for nota in notas]
+        for nota, value, valid in zip(
+            notas, values, validate_documents(values)
+        ):
+            if valid is None:
+                yield {'id': nota.id, 'field': field, 'value': value}
+
+
+@job_handler('revalidate_documents', DateRangePayload)
+async def revalidate_documents(payload: DateRangePayload) -> dict[str, Any]:
+    """
+    Confere de novo os CPFs/CNPJs das notas do período, como as notas
+    gravadas antes da validação dos dígitos verificadores
+    """
+    start = datetime.combine(payload.start_date, time.min)
+    end = datetime.combine(payload.end_date + timedelta(days=1), time.min)
+
+    checked, invalid, reported = 0, 0, []
+    async with new_session() as session:
+        notas = NotaFiscalRepository(session).stream(start=start, end=end)
+        async for chunk in _chunks(notas, STREAM_CHUNK_SIZE):
+            checked += len(chunk)
+            for found in _invalid_documents(chunk):
+                invalid += 1
+                if len(reported) < MAX_REPORTED_INVALID:
+                    reported.append(found)
+
+    return {'checked': checked, 'invalid': invalid, 'notas': reported}
@@ -0,0 +1,237 @@
+"""
+Worker da fila de tarefas (tabela jobs).
+
+Consulta a fila no Postgres, reserva as tarefas pendentes com
+SELECT … FOR UPDATE SKIP LOCKED e as executa em um pool de processos,
+fora dos workers da API. Vários workers (ou containers) podem
+consumir a mesma fila ao mesmo tempo.
+
+Uso pela linha de comando (a partir de backend/):
+    python -m src.jobs.worker
+    python -m src.jobs.worker --processes 4
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from src.db.database import engine, new_session
+from src.db.partitions import ensure_partitions
+from src.documents.cache import danfe_cache
+from src.jobs.handlers import JOB_HANDLERS
+from src.models.job_model import JobModel
+from src.repositories.job_repository import JobRepository
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Intervalo entre as conferências das partições mensais de nota_fiscal
+PARTITIONS_INTERVAL_SECONDS = 3600
+# Intervalo entre as limpezas do cache em disco dos PDFs (DANFE)
+DANFE_PRUNE_INTERVAL_SECONDS = 600
+
+
+async def _run_handler(kind: str, payload: dict[str, Any]) -> dict[str, Any]:
+    handler = JOB_HANDLERS[kind]
+    try:
+        return await handler.func(
+            handler.payload_schema.model_validate(payload)
+        )
+    finally:
+        # Cada tarefa roda em um event loop novo; as conexões do pool
+        # ficam presas ao loop que as abriu
+        await engine.dispose()
+
+
+def run_job(kind: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Executada nos processos do pool, por isso recebe e devolve apenas
+    dados serializáveis
+    """
+    return asyncio.run(_run_handler(kind, payload))
+
+
+def create_process_pool(processes: int) -> ProcessPoolExecutor:
+    # spawn evita herdar a conexão do processo principal via fork
+    return ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+async def _claim_jobs(limit: int):
+    async with new_session() as session:
+        return await JobRepository(session).claim(limit)
+
+
+async def _finish_job(job: JobModel, result=None, error=None):
+    async with new_session() as session:
+        repo = JobRepository(session)
+        if error is None:
+            await repo.complete(job.id, job.attempts, result)
+        else:
+            await repo.fail(
+                job.id, job.attempts, error, settings.JOB_RETRY_DELAY_SECONDS
+            )
+
+
+async def _ensure_partitions():
+    """Partições dos próximos meses, antes que as notas cheguem"""
+    try:
+        async with engine.begin() as connection:
+            created = await ensure_partitions(connection)
+    except Exception:
+        # A falha não interrompe a fila; tenta de novo no intervalo
+        logger.exception('Falha ao criar as partições de nota_fiscal')
+        return
+    for name in created:
+        logger.info('Partição criada: %s', name)
+
+
+async def _prune_danfe_cache():
+    """Mantém o cache dos PDFs dentro de DANFE_CACHE_MAX_SIZE_MB"""
+    if not settings.DANFE_CACHE_MAX_SIZE_MB:
+        return
+    max_bytes = settings.DANFE_CACHE_MAX_SIZE_MB * 1024 * 1024
+    try:
+        # Percorre o diretório fora do event loop
+        removed = await asyncio.to_thread(danfe_cache.prune, max_bytes)
+    except OSError:
+        logger.exception('Falha ao limpar o cache dos PDFs')
+        return
+    if removed:
+        logger.info('Arquivos apagados do cache dos PDFs: %s', removed)
+
+
+class JobWorker:
+    """
+    Mantém no máximo `processes` tarefas em execução: reserva novas
+    tarefas à medida que os processos ficam livres e, entre uma
+    consulta e outra, renova o sinal de vida das tarefas em andamento.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.executor = create_process_pool(processes)
+        self.running: dict[asyncio.Task, int] = {}
+        self.stopping = asyncio.Event()
+        self.next_partitions = 0.0
+        self.next_danfe_prune = 0.0
+
+    async def run(self):
+        maintenance_interval = settings.JOB_STALE_AFTER_SECONDS / 3
+        next_maintenance = 0.0
+        stopping = asyncio.create_task(self.stopping.wait())
+
+        while not self.stopping.is_set():
+            if time.monotonic() >= next_maintenance:
+                await self._maintenance()
+                next_maintenance = time.monotonic() + maintenance_interval
+
+            free = self.processes - len(self.running)
+            if free:
+                for job in await _claim_jobs(free):
+                    task = asyncio.create_task(self._execute(job))
+                    self.running[task] = job.id
+                    task.add_done_callback(self.running.pop)
+
+            # Com processos livres a fila está vazia: consulta de novo
+            # após o intervalo ou quando uma tarefa terminar. Com todos
+            # ocupados, só espera uma tarefa terminar (ou a manutenção)
+            timeout = max(next_maintenance - time.monotonic(), 0)
+            if len(self.running) < self.processes:
+                timeout = min(timeout, settings.JOB_POLL_INTERVAL_SECONDS)
+            await asyncio.wait(
+                [*self.running, stopping],
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+        # Encerramento: não reserva novas tarefas e conclui as atuais
+        stopping.cancel()
+        if self.running:
+            await asyncio.wait(self.running)
+        self.executor.shutdown()
+
+    def stop(self):
+        self.stopping.set()
+
+    async def _maintenance(self):
+        async with new_session() as session:
+            repo = JobRepository(session)
+            await repo.heartbeat(list(self.running.values()))
+            await repo.requeue_stale(
+                settings.JOB_STALE_AFTER_SECONDS,
+                settings.JOB_RETRY_DELAY_SECONDS,
+            )
+
+        if time.monotonic() >= self.next_partitions:
+            await _ensure_partitions()
+            self.next_partitions = (
+                time.monotonic() + PARTITIONS_INTERVAL_SECONDS
+            )
+
+        if time.monotonic() >= self.next_danfe_prune:
+            await _prune_danfe_cache()
+            self.next_danfe_prune = (
+                time.monotonic() + DANFE_PRUNE_INTERVAL_SECONDS
+            )
+
+    async def _execute(self, job: JobModel):
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            result = await loop.run_in_executor(
+                executor, run_job, job.kind, job.payload
+            )
+        except BrokenProcessPool:
+            # Um processo morreu (falta de memória, sinal): o pool não
+            # aceita mais tarefas e é substituído uma única vez, mesmo
+            # com várias tarefas falhando juntas
+            logger.exception('Pool de processos interrompido')
+            await _finish_job(job, error='Worker process terminated')
+            if executor is self.executor:
+                self._replace_pool()
+        except Exception as exc:
+            logger.exception('Falha na tarefa %s (%s)', job.id, job.kind)
+            await _finish_job(job, error=f'{type(exc).__name__}: {exc}')
+        else:
+            await _finish_job(job, result=result)
+
+    def _replace_pool(self):
+        broken, self.executor = (
+            self.executor,
+            create_process_pool(self.processes),
+        )
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def _main(processes: int):
+    worker = JobWorker(processes)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    print(f'👷 Worker da fila com {processes} processos')
+    try:
+        await worker.run()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Executa a fila de tarefas')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=settings.JOB_WORKERS or os.cpu_count() or 1,
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.processes))
@@ -0,0 +1,28 @@
+"""
+Importação tardia de módulos pesados.
+
+lazy_import devolve o módulo sem executá-lo; o código do módulo só
+roda no primeiro acesso a um atributo. Usado para dependências que
+custam dezenas de milissegundos na subida e só são necessárias em
+algumas rotas (ver benchmarks/cold_start.py).
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,177 @@
+"""
+Métricas de requisições HTTP e de SQL, expostas no formato texto do
+Prometheus em GET /metrics.
+
+Os valores são mantidos em memória por processo: com vários workers,
+cada um responde com os próprios números.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Limites (em segundos) dos buckets do histograma de latência
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Contadores por rota: nome da métrica -> atributo de RouteMetrics
+ROUTE_COUNTERS = {
+    'http_request_db_queries_total': 'queries',
+    'http_request_db_seconds_total': 'db_seconds',
+}
+
+
+@dataclass
+class RequestStats:
+    """Consultas SQL executadas durante uma requisição"""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+@dataclass
+class RouteMetrics:
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * len(LATENCY_BUCKETS)
+    )
+    count: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    db_seconds: float = 0.0
+
+    def observe(self, seconds: float, stats: RequestStats) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.queries += stats.queries
+        self.db_seconds += stats.db_seconds
+        for index, limit in enumerate(LATENCY_BUCKETS):
+            if seconds <= limit:
+                self.buckets[index] += 1
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar(
+    'current_request', default=None
+)
+route_metrics: dict[tuple[str, str, int], RouteMetrics] = {}
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Registra eventos no engine para somar, à requisição em andamento,
+    a quantidade de consultas e o tempo gasto no banco.
+    """
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, *args):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, *args):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede a latência por rota, agrega as consultas
+    SQL da requisição e envia o cabeçalho Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                total_ms = (time.perf_counter() - start) * 1000
+                server_timing = (
+                    f'db;desc="{stats.queries} queries";'
+                    f'dur={stats.db_seconds * 1000:.1f}, '
+                    f'app;dur={total_ms:.1f}'
+                )
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', server_timing.encode()))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            # Usa o template da rota (ex.: /emitentes/{emitente_id}) para
+            # não criar uma série por ID
+            route = scope.get('route')
+            path = getattr(route, 'path', 'unmatched')
+            key = (scope['method'], path, status_code)
+            metrics = route_metrics.setdefault(key, RouteMetrics())
+            metrics.observe(time.perf_counter() - start, stats)
+
+
+def _labels(key: tuple[str, str, int]) -> str:
+    method, path, status = key
+    return f'method="{method}",route="{path}",status="{status}"'
+
+
+def render_prometheus(
+    gauges: dict[str, float] | None = None,
+    counters: dict[str, float] | None = None,
+) -> str:
+    """
+    Gera o texto no formato de exposição do Prometheus com as métricas
+    por rota e os valores avulsos recebidos em gauges/counters
+    """
+    series = sorted(route_metrics.items())
+    histogram = 'http_request_duration_seconds'
+    lines = [f'# TYPE {histogram} histogram']
+
+    for key, metrics in series:
+        labels = _labels(key)
+        for limit, count in zip(LATENCY_BUCKETS, metrics.buckets):
+            bucket = f'{labels},le="{limit}"'
+            lines.append(f'{histogram}_bucket{{{bucket}}} {count}')
+        lines.extend([
+            f'{histogram}_bucket{{{labels},le="+Inf"}} {metrics.count}',
+            f'{histogram}_sum{{{labels}}} {metrics.seconds}',
+            f'{histogram}_count{{{labels}}} {metrics.count}',
+        ])
+
+    for name, attribute in ROUTE_COUNTERS.items():
+        lines.append(f'# TYPE {name} counter')
+        for key, metrics in series:
+            value = getattr(metrics, attribute)
+            lines.append(f'{name}{{{_labels(key)}}} {value}')
+
+    for name, value in (gauges or {}).items():
+        lines.extend([f'# TYPE {name} gauge', f'{name} {value}'])
+
+    for name, value in (counters or {}).items():
+        lines.extend([f'# TYPE {name} counter', f'{name} {value}'])
+
+    return '\n'.join(lines) + '\n'
@@ -1,18 +1,53 @@
-from sqlalchemy import Boolean, String, text
+from sqlalchemy import Boolean, Computed, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.abstract_base import AbstractBaseModel
 from src.models.registry import table_registry
+from src.normalization import document_key_sql, name_key_sql
 
 
 @table_registry.mapped_as_dataclass
 class EmitenteModel(AbstractBaseModel):
     __tablename__ = 'emitentes'
+    __table_args__ = (
+        # Índices trigram para buscas com curinga no início (autocomplete)
+        Index(
+            'ix_emitentes_name_key_trgm',
+            'name_key',
+            postgresql_using='gin',
+            postgresql_ops={'name_key': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_emitentes_cnpj_digits_trgm',
+            'cnpj_digits',
+            postgresql_using='gin',
+            postgresql_ops={'cnpj_digits': 'gin_trgm_ops'},
+        ),
+        # Autocomplete na ordem (name_key, id), parando nos primeiros
+        # registros; pela collation C, também atende aos LIKE de prefixo
+        Index('ix_emitentes_name_key_id', 'name_key', 'id'),
+    )
 
     name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    # Nome normalizado para o autocomplete, mantido pelo banco como em
+    # src/normalization.py; ordenado byte a byte (collation C), igual às
+    # strings do Python
+    name_key: Mapped[str] = mapped_column(
+        String(100, collation='C'),
+        Computed(name_key_sql('name'), persisted=True),
+        init=False,
+    )
     cnpj: Mapped[str] = mapped_column(
         String(20), unique=True, nullable=False, index=True
     )
+    # Documento normalizado, mantido pelo banco: dígitos e letras (CNPJ
+    # alfanumérico) em maiúsculas, como em document_key
+    cnpj_digits: Mapped[str] = mapped_column(
+        String(20),
+        Computed(document_key_sql('cnpj'), persisted=True),
+        index=True,
+        init=False,
+    )
     phone: Mapped[str] = mapped_column(String(20), nullable=True, index=True)
     email: Mapped[str] = mapped_column(String(100), nullable=True, index=True)
     active: Mapped[bool] = mapped_column(
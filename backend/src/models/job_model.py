@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.abstract_base import AbstractBaseModel
+from src.models.registry import table_registry
+
+# pending -> running -> succeeded | failed; uma falha com tentativas
+# restantes volta para pending com run_after no futuro
+JOB_STATUSES = ('pending', 'running', 'succeeded', 'failed')
+
+
+@table_registry.mapped_as_dataclass
+class JobModel(AbstractBaseModel):
+    """
+    Tarefa da fila de processamento em segundo plano.
+
+    Os workers (python -m src.jobs.worker) reservam as tarefas
+    pendentes com SELECT … FOR UPDATE SKIP LOCKED; enquanto uma tarefa
+    está em execução, updated_at funciona como sinal de vida do worker.
+    """
+
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Apenas a fila: as tarefas concluídas não entram no índice
+        Index(
+            'ix_jobs_pending',
+            'run_after',
+            'id',
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    user_id: Mapped[int | None] = mapped_column(
+        ForeignKey('users.id', ondelete='SET NULL'), index=True
+    )
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default='pending',
+        server_default='pending',
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default='0', nullable=False
+    )
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSONB, default=None)
+    error: Mapped[str | None] = mapped_column(Text, default=None)
+    run_after: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False, init=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        default=None, init=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        default=None, init=False
+    )
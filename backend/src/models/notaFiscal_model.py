@@ -1,9 +1,12 @@
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Numeric, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.abstract_base import AbstractBaseModel
+from src.models.destinatario_model import DestinatarioModel
+from src.models.emitente_model import EmitenteModel
 from src.models.registry import table_registry
 
 
@@ -16,9 +19,43 @@ class NotaFiscal(AbstractBaseModel):
     - id (chave primária)
     - created_at (data de criação)
     - updated_at (data de atualização)
+
+    A tabela é particionada por mês de created_at (ver
+    src/db/partitions.py). A chave primária da tabela precisa incluir a
+    coluna de particionamento; para o ORM, a identidade continua sendo
+    apenas o id, gerado pela sequência.
     """
 
     __tablename__ = 'nota_fiscal'
+    __table_args__ = (
+        # Chave de ordenação usada na paginação por keyset
+        Index('ix_nota_fiscal_created_at_id', 'created_at', 'id'),
+        # Atendem as chaves estrangeiras e a listagem por emitente ou
+        # destinatário na mesma ordem da paginação
+        Index(
+            'ix_nota_fiscal_emitente_id_created_at_id',
+            'emitente_id',
+            'created_at',
+            'id',
+        ),
+        Index(
+            'ix_nota_fiscal_destinatario_id_created_at_id',
+            'destinatario_id',
+            'created_at',
+            'id',
+        ),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    __mapper_args__ = {'primary_key': ['id']}
+
+    # Chave primária (id, created_at); com a chave composta, o
+    # autoincremento (SERIAL) do id precisa ser explícito
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, init=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        primary_key=True, server_default=func.now(), init=False
+    )
 
     # Identificação da Nota Fiscal
     numero_nota: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -47,3 +84,23 @@ class NotaFiscal(AbstractBaseModel):
     desconto: Mapped[Decimal | None] = mapped_column(
         Numeric(10, 2), nullable=True
     )
+
+    # Cadastros correspondentes ao CNPJ do emitente e ao CPF/CNPJ do
+    # destinatário; ficam vazios quando o documento não está cadastrado
+    emitente_id: Mapped[int | None] = mapped_column(
+        ForeignKey('emitentes.id', ondelete='SET NULL'),
+        nullable=True,
+        init=False,
+    )
+    destinatario_id: Mapped[int | None] = mapped_column(
+        ForeignKey('destinatarios.id', ondelete='SET NULL'),
+        nullable=True,
+        init=False,
+    )
+    # lazy='raise': os cadastros só são lidos com joinedload explícito
+    emitente: Mapped[EmitenteModel | None] = relationship(
+        init=False, lazy='raise'
+    )
+    destinatario: Mapped[DestinatarioModel | None] = relationship(
+        init=False, lazy='raise'
+    )
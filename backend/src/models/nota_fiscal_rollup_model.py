@@ -0,0 +1,37 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.abstract_base import AbstractBaseModel
+from src.models.registry import table_registry
+
+
+@table_registry.mapped_as_dataclass
+class NotaFiscalDailyTotal(AbstractBaseModel):
+    """
+    Totais pré-agregados das notas fiscais por CNPJ do emitente e dia;
+    o CNPJ é gravado na forma de document_key (sem pontuação).
+
+    Mantido de forma incremental pelo NotaFiscalRepository a cada
+    inserção, para que relatórios não precisem varrer nota_fiscal.
+    """
+
+    __tablename__ = 'nota_fiscal_daily_totals'
+    __table_args__ = (
+        UniqueConstraint(
+            'cnpj_emitente', 'dia', name='uq_nota_fiscal_daily_totals'
+        ),
+    )
+
+    cnpj_emitente: Mapped[str] = mapped_column(String(18), nullable=False)
+    dia: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False)
+    valor_total: Mapped[Decimal] = mapped_column(
+        Numeric(16, 2), nullable=False
+    )
+    icms: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+    pis: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+    cofins: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
+    desconto: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False)
@@ -0,0 +1,56 @@
+"""
+Normalização dos termos do autocomplete de emitentes e destinatários,
+a mesma no índice em memória (src/search_index.py) e no banco (colunas
+geradas name_key e cnpj_digits/cpf_cnpj_digits).
+
+- nome: sem acentos, em minúsculas e com as palavras separadas por um
+  espaço ('São João - ME' -> 'sao joao me');
+- documento: dígitos e letras em maiúsculas (document_key).
+"""
+
+import re
+
+from src.validators.document_validator import document_key
+
+# Letras acentuadas e as suas versões sem acento, na mesma posição; o
+# banco usa a mesma tabela com translate()
+ACCENTED = 'ÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝàáâãäåçèéêëìíîïñòóôõöùúûüýÿ'
+UNACCENTED = 'AAAAAACEEEEIIIINOOOOOUUUUYaaaaaaceeeeiiiinooooouuuuyy'
+# Caracteres mínimos para buscar pelo documento
+MIN_DOCUMENT_PREFIX = 2
+
+_UNACCENT = str.maketrans(ACCENTED, UNACCENTED)
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Palavras normalizadas: 'São João - ME' -> ['sao', 'joao', 'me']"""
+    words = _NON_WORD.split(text.translate(_UNACCENT).lower())
+    return [word for word in words if word]
+
+
+def name_key(name: str) -> str:
+    return ' '.join(tokenize(name))
+
+
+def name_key_sql(column: str) -> str:
+    """Expressão SQL equivalente a name_key, para colunas geradas"""
+    return (
+        f"btrim(regexp_replace(lower(translate({column}, '{ACCENTED}', "
+        f"'{UNACCENTED}')), '[^0-9a-z]+', ' ', 'g'))"
+    )
+
+
+def document_key_sql(column: str) -> str:
+    """Expressão SQL equivalente a document_key, para colunas geradas"""
+    return f"upper(regexp_replace({column}, '[^0-9A-Za-z]', '', 'g'))"
+
+
+def document_prefix(query: str) -> str:
+    """
+    Termo da busca por documento na forma de document_key; vazio quando
+    a busca não tem dígitos, isto é, procura apenas um nome
+    """
+    if not any(char.isdigit() for char in query):
+        return ''
+    return document_key(query)
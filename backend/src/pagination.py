@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Gera um cursor opaco a partir da chave de ordenação
+    (created_at, id) do último item de uma página
+    """
+    raw = json.dumps([created_at.isoformat(), item_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Converte um cursor opaco de volta para a chave (created_at, id).
+    Lança ValueError quando o cursor não é válido
+    """
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError('Invalid cursor') from exc
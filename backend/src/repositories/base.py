@@ -0,0 +1,188 @@
+from typing import Any, Generic, Literal, Sequence, TypeVar
+
+from sqlalchemy import Row, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.normalization import document_prefix, name_key
+
+ModelT = TypeVar('ModelT')
+
+# O que fazer quando o registro já existe na chave única:
+# reject - não altera nada e a rota responde 409
+# ignore - mantém o registro existente e o retorna
+# update - sobrescreve o registro existente com os novos dados
+ConflictMode = Literal['reject', 'ignore', 'update']
+
+# Registros encontrados pelo autocomplete no banco que são ordenados por
+# similaridade; os demais ficam de fora do resultado
+SEARCH_CANDIDATES = 500
+
+
+class BaseRepository(Generic[ModelT]):
+    """
+    Operações comuns aos repositórios de cadastros. As subclasses
+    definem `model` com o model ORM que manipulam.
+    """
+
+    model: type[ModelT]
+    # Índice de autocomplete mantido a cada gravação (src/search_index)
+    search_index = None
+    # Coluna do documento normalizado usada pelo autocomplete (search)
+    search_document: str | None = None
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _indexed(self, entity: ModelT | None) -> ModelT | None:
+        if entity is not None and self.search_index is not None:
+            self.search_index.upsert(entity)
+        return entity
+
+    async def get_by_id(self, entity_id: int) -> ModelT | None:
+        return await self.session.get(self.model, entity_id)
+
+    async def search(self, query: str, limit: int = 10) -> Sequence[ModelT]:
+        """
+        Autocomplete no banco: nomes que contêm a busca (sem acentos e
+        sem diferenciar maiúsculas, pela coluna name_key) ou documentos
+        que contêm o documento da busca (document_prefix), ordenados por
+        similaridade (pg_trgm).
+
+        As condições usam os índices trigram de name_key e do documento,
+        que atendem LIKE com curinga no início. Apenas os primeiros
+        SEARCH_CANDIDATES registros encontrados são ordenados, para que
+        uma busca curta não ordene a tabela inteira.
+        """
+        name_column = self.model.name_key
+        document_column = getattr(self.model, self.search_document)
+
+        conditions, ranks = [], []
+        name = name_key(query)
+        if name:
+            conditions.append(name_column.like(f'%{name}%'))
+            ranks.append(func.similarity(name_column, name))
+        document = document_prefix(query)
+        if document:
+            conditions.append(document_column.like(f'%{document}%'))
+            ranks.append(func.similarity(document_column, document))
+        if not conditions:
+            return []
+
+        candidates = (
+            select(self.model.id, func.greatest(*ranks).label('rank'))
+            .where(or_(*conditions))
+            .limit(SEARCH_CANDIDATES)
+            .subquery()
+        )
+        stmt = (
+            select(self.model)
+            .join(candidates, candidates.c.id == self.model.id)
+            .order_by(candidates.c.rank.desc(), name_column, self.model.id)
+            .limit(limit)
+        )
+        return (await self.session.scalars(stmt)).all()
+
+    async def insert_on_conflict(
+        self,
+        values: dict[str, Any],
+        conflict_column: str,
+        mode: ConflictMode = 'reject',
+    ) -> tuple[ModelT | None, bool]:
+        """
+        INSERT … ON CONFLICT (conflict_column) em uma única ida ao banco,
+        sem consulta prévia e sem IntegrityError em cadastros
+        concorrentes. Retorna o registro e se ele foi inserido.
+        Em conflito: 'reject' retorna (None, False), 'ignore' retorna o
+        registro existente e 'update' o registro sobrescrito.
+        """
+        stmt = pg_insert(self.model).values(values)
+
+        if mode == 'update':
+            changes = {
+                column: stmt.excluded[column]
+                for column in values
+                if column != conflict_column
+            }
+            # O onupdate do model não vale para o ON CONFLICT DO UPDATE
+            changes['updated_at'] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[conflict_column], set_=changes
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[conflict_column]
+            )
+
+        # xmax = 0 apenas nas linhas inseridas pelo comando
+        inserted = literal_column('xmax = 0')
+        stmt = stmt.returning(self.model, inserted).execution_options(
+            populate_existing=True
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        await self.session.commit()
+
+        if row is not None:
+            return self._indexed(row[0]), row[1]
+        if mode == 'reject':
+            return None, False
+
+        # ON CONFLICT DO NOTHING não retorna a linha existente
+        column = getattr(self.model, conflict_column)
+        existing = await self.session.scalar(
+            select(self.model).where(column == values[conflict_column])
+        )
+        return existing, False
+
+    async def _update_returning(
+        self, entity_id: int, values: dict[str, Any], *where, extra=()
+    ) -> Row | None:
+        """
+        Executa UPDATE … WHERE id = :id RETURNING * em uma única ida ao
+        banco e confirma a transação. O primeiro item da linha é o
+        registro atualizado (já sincronizado na sessão), seguido das
+        expressões de `extra`. Retorna None quando nenhuma linha atende
+        ao id e às condições de `where`.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == entity_id, *where)
+            .values(values)
+            .returning(self.model, *extra)
+            .execution_options(populate_existing=True)
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
+        await self.session.commit()
+        if row is not None:
+            self._indexed(row[0])
+        return row
+
+    async def update_by_id(
+        self, entity_id: int, values: dict[str, Any], *where
+    ) -> ModelT | None:
+        """
+        Atualiza os campos de `values` e retorna o registro atualizado,
+        ou None quando ele não existe (as rotas respondem 404).
+        """
+        if not values:
+            return await self.get_by_id(entity_id)
+
+        row = await self._update_returning(entity_id, values, *where)
+        return row[0] if row else None
+
+    async def set_active(
+        self, entity_id: int, active: bool
+    ) -> tuple[ModelT | None, bool]:
+        """
+        Ativa ou desativa com um UPDATE condicional, que só altera a
+        linha quando o estado é diferente. Retorna o registro e se o
+        estado mudou; o registro é None quando o id não existe.
+        """
+        entity = await self.update_by_id(
+            entity_id, {'active': active}, self.model.active != active
+        )
+        if entity is not None:
+            return entity, True
+
+        # Nada foi alterado: o registro não existe ou já estava no estado
+        return await self.get_by_id(entity_id), False
@@ -1,23 +1,23 @@
-from sqlalchemy import or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from sqlalchemy import func, select
 
 from src.models.destinatario_model import DestinatarioModel
+from src.repositories.base import BaseRepository, ConflictMode
+from src.schemas.destinatario_schema import DestinatarioUpdate
+from src.search_index import destinatario_index
 
 
-class DestinatarioRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class DestinatarioRepository(BaseRepository[DestinatarioModel]):
+    model = DestinatarioModel
+    search_index = destinatario_index
+    search_document = 'cpf_cnpj_digits'
 
     async def create(
-        self, destinatario: DestinatarioModel
-    ) -> DestinatarioModel:
-        self.session.add(destinatario)
-        await self.session.commit()
-        await self.session.refresh(destinatario)
-        return destinatario
-
-    async def get_by_id(self, destinatario_id: int):
-        return await self.session.get(DestinatarioModel, destinatario_id)
+        self, values: dict, on_conflict: ConflictMode = 'reject'
+    ) -> tuple[DestinatarioModel | None, bool]:
+        """Cadastra o destinatário tratando um CPF/CNPJ já existente"""
+        return await self.insert_on_conflict(values, 'cpf_cnpj', on_conflict)
 
     async def get_by_cpf_cnpj(self, documento: str):
         return await self.session.scalar(
@@ -31,42 +31,18 @@ class DestinatarioRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def search(self, query: str, query_clean: str, limit: int = 10):
-        """
-        Busca destinatários por nome ou CNPJ.
-        query: termo de busca original
-        query_clean: termo de busca sem formatação (para CPF/CNPJ)
-        limit: número máximo de resultados
-        """
-        stmt = (
-            select(DestinatarioModel)
-            .where(
-                or_(
-                    DestinatarioModel.name.ilike(f'%{query}%'),
-                    DestinatarioModel.cpf_cnpj.ilike(f'%{query_clean}%'),
-                )
-            )
-            .limit(limit)
+    async def list_version(self) -> tuple[int, datetime | None]:
+        """Quantidade de destinatários e a última alteração, para a ETag"""
+        result = await self.session.execute(
+            select(func.count(), func.max(DestinatarioModel.updated_at))
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return tuple(result.one())
 
     async def update(
-        self, destinatario_id: int, destinatario_update: dict
-    ) -> DestinatarioModel:
+        self, destinatario_id: int, destinatario_update: DestinatarioUpdate
+    ) -> DestinatarioModel | None:
         """
         Atualiza um destinatário com os dados fornecidos
         """
-        db_destinatario = await self.get_by_id(destinatario_id)
-
-        if not db_destinatario:
-            return None
-
-        # Atualiza os campos
         update_data = destinatario_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_destinatario, field, value)
-
-        await self.session.commit()
-        await self.session.refresh(db_destinatario)
-        return db_destinatario
+        return await self.update_by_id(destinatario_id, update_data)
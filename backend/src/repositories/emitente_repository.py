@@ -1,22 +1,23 @@
-from sqlalchemy import or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 
-from src.models.emitente_model import EmitenteModel
-from src.schemas.emitente_schema import EmitenteUpdate
+from sqlalchemy import func, select
 
+from src.models.emitente_model import EmitenteModel
+from src.repositories.base import BaseRepository, ConflictMode
+from src.schemas.emitente_schema import EmitenteStatusChanger, EmitenteUpdate
+from src.search_index import emitente_index
 
-class EmitenteRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
 
-    async def create(self, emitente: EmitenteModel) -> EmitenteModel:
-        self.session.add(emitente)
-        await self.session.commit()
-        await self.session.refresh(emitente)
-        return emitente
+class EmitenteRepository(BaseRepository[EmitenteModel]):
+    model = EmitenteModel
+    search_index = emitente_index
+    search_document = 'cnpj_digits'
 
-    async def get_by_id(self, emitente_id: int):
-        return await self.session.get(EmitenteModel, emitente_id)
+    async def create(
+        self, values: dict, on_conflict: ConflictMode = 'reject'
+    ) -> tuple[EmitenteModel | None, bool]:
+        """Cadastra o emitente tratando um CNPJ já existente"""
+        return await self.insert_on_conflict(values, 'cnpj', on_conflict)
 
     async def get_by_cnpj(self, cnpj: str):
         return await self.session.scalar(
@@ -28,42 +29,20 @@ class EmitenteRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def search(self, query: str, query_clean: str, limit: int = 10):
-        """
-        Busca emitentes por nome ou CNPJ.
-        query: termo de busca original
-        query_clean: termo de busca sem formatação (para CNPJ)
-        limit: número máximo de resultados
-        """
-        stmt = (
-            select(EmitenteModel)
-            .where(
-                or_(
-                    EmitenteModel.name.ilike(f'%{query}%'),
-                    EmitenteModel.cnpj.ilike(f'%{query_clean}%'),
-                )
-            )
-            .limit(limit)
+    async def list_version(self) -> tuple[int, datetime | None]:
+        """Quantidade de emitentes e a última alteração, para a ETag"""
+        result = await self.session.execute(
+            select(func.count(), func.max(EmitenteModel.updated_at))
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return tuple(result.one())
 
     async def update(
-        self, emitente_id: int, emitente_update: EmitenteUpdate
-    ) -> EmitenteModel:
+        self,
+        emitente_id: int,
+        emitente_update: EmitenteUpdate | EmitenteStatusChanger,
+    ) -> EmitenteModel | None:
         """
         Atualiza um emitente com os dados fornecidos
         """
-        db_emitente = await self.get_by_id(emitente_id)
-
-        if not db_emitente:
-            return None
-
-        # Atualiza os campos
         update_data = emitente_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_emitente, field, value)
-
-        await self.session.commit()
-        await self.session.refresh(db_emitente)
-        return db_emitente
+        return await self.update_by_id(emitente_id, update_data)
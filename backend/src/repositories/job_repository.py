@@ -0,0 +1,153 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import case, func, select, update
+
+from src.models.job_model import JobModel
+from src.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[JobModel]):
+    """
+    Fila de tarefas em uma tabela do Postgres. Vários workers consultam
+    a mesma fila: FOR UPDATE SKIP LOCKED faz cada um reservar tarefas
+    diferentes sem esperar pelos bloqueios dos outros.
+    """
+
+    model = JobModel
+
+    async def submit(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        user_id: int | None,
+        max_attempts: int,
+    ) -> JobModel:
+        job = JobModel(
+            kind=kind,
+            payload=payload,
+            user_id=user_id,
+            max_attempts=max_attempts,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get_for_user(self, job_id: int, user_id: int) -> JobModel | None:
+        return await self.session.scalar(
+            select(JobModel).where(
+                JobModel.id == job_id, JobModel.user_id == user_id
+            )
+        )
+
+    async def claim(self, limit: int) -> Sequence[JobModel]:
+        """
+        Reserva até `limit` tarefas pendentes, em ordem de chegada,
+        marcando-as como em execução na mesma instrução
+        """
+        pending = (
+            select(JobModel.id)
+            .where(
+                JobModel.status == 'pending',
+                JobModel.run_after <= func.now(),
+            )
+            .order_by(JobModel.run_after, JobModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(JobModel)
+            .where(JobModel.id.in_(pending))
+            .values(
+                status='running',
+                attempts=JobModel.attempts + 1,
+                started_at=func.now(),
+                finished_at=None,
+            )
+            .returning(JobModel)
+            .execution_options(populate_existing=True)
+        )
+        jobs = (await self.session.scalars(stmt)).all()
+        await self.session.commit()
+        return jobs
+
+    async def complete(
+        self, job_id: int, attempts: int, result: dict[str, Any]
+    ) -> None:
+        """
+        Conclui a tentativa `attempts` (o valor devolvido por claim); se
+        a tarefa já foi devolvida à fila e reservada de novo, o resultado
+        da tentativa antiga é descartado
+        """
+        await self.session.execute(
+            update(JobModel)
+            .where(
+                JobModel.id == job_id,
+                JobModel.status == 'running',
+                JobModel.attempts == attempts,
+            )
+            .values(
+                status='succeeded',
+                result=result,
+                error=None,
+                finished_at=func.now(),
+            )
+        )
+        await self.session.commit()
+
+    async def fail(
+        self, job_id: int, attempts: int, error: str, retry_delay: float
+    ) -> None:
+        """
+        Devolve a tarefa para a fila, com espera crescente, enquanto
+        houver tentativas; na última ela termina como failed. Assim como
+        em complete, só vale para a tentativa `attempts`
+        """
+        await self._retry_or_fail(
+            error,
+            retry_delay,
+            JobModel.id == job_id,
+            JobModel.status == 'running',
+            JobModel.attempts == attempts,
+        )
+
+    async def heartbeat(self, job_ids: list[int]) -> None:
+        """Sinal de vida das tarefas que este worker está executando"""
+        if not job_ids:
+            return
+        await self.session.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(job_ids), JobModel.status == 'running')
+            .values(updated_at=func.now())
+        )
+        await self.session.commit()
+
+    async def requeue_stale(self, stale_after: float, retry_delay: float):
+        """
+        Tarefas em execução sem sinal de vida há `stale_after` segundos
+        pertencem a um worker que parou; contam como uma falha
+        """
+        await self._retry_or_fail(
+            'Worker stopped while running the job',
+            retry_delay,
+            JobModel.status == 'running',
+            JobModel.updated_at < func.now() - timedelta(seconds=stale_after),
+        )
+
+    async def _retry_or_fail(self, error: str, retry_delay: float, *where):
+        exhausted = JobModel.attempts >= JobModel.max_attempts
+        await self.session.execute(
+            update(JobModel)
+            .where(*where)
+            .values(
+                status=case((exhausted, 'failed'), else_='pending'),
+                error=error,
+                run_after=func.now()
+                + JobModel.attempts * timedelta(seconds=retry_delay),
+                finished_at=case((exhausted, func.now()), else_=None),
+            )
+        )
+        await self.session.commit()
@@ -1,7 +1,64 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import date, datetime, time
+
+from sqlalchemy import (
+    Date,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from src.models.destinatario_model import DestinatarioModel
+from src.models.emitente_model import EmitenteModel
+from src.models.nota_fiscal_rollup_model import NotaFiscalDailyTotal
 from src.models.notaFiscal_model import NotaFiscal
+from src.normalization import document_key_sql
+from src.validators.document_validator import document_key
+
+ROLLUP_FIELDS = ('valor_total', 'icms', 'pis', 'cofins', 'desconto')
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def _daily_totals(*where) -> Select:
+    """
+    Notas que atendem a `where` somadas por emitente e dia. O emitente é
+    o documento normalizado (document_key): notas gravadas com e sem
+    pontuação somam na mesma linha.
+    """
+    dia = cast(NotaFiscal.created_at, Date)
+    emitente = literal_column(document_key_sql('cnpj_emitente'))
+    return (
+        select(
+            emitente,
+            dia,
+            func.count(),
+            *(
+                func.coalesce(func.sum(getattr(NotaFiscal, field)), 0)
+                for field in ROLLUP_FIELDS
+            ),
+        )
+        .where(*where)
+        .group_by(emitente, dia)
+    )
+
+
+def _party_id(id_column, key_column, document: str):
+    """Subconsulta escalar com o id do cadastro do documento, ou NULL"""
+    return (
+        select(func.min(id_column))
+        .where(key_column == document_key(document))
+        .scalar_subquery()
+    )
 
 
 class NotaFiscalRepository:
@@ -9,15 +66,255 @@ class NotaFiscalRepository:
         self.session = session
 
     async def create(self, nota_fiscal: NotaFiscal) -> NotaFiscal:
+        # Os cadastros são resolvidos por subconsultas dentro do próprio
+        # INSERT; o refresh após o commit lê os ids gravados
+        nota_fiscal.emitente_id = _party_id(
+            EmitenteModel.id,
+            EmitenteModel.cnpj_digits,
+            nota_fiscal.cnpj_emitente,
+        )
+        nota_fiscal.destinatario_id = _party_id(
+            DestinatarioModel.id,
+            DestinatarioModel.cpf_cnpj_digits,
+            nota_fiscal.cpf_ou_cnpj_destinatario,
+        )
+
         self.session.add(nota_fiscal)
+        await self.session.flush()
+        await self._add_to_rollup([nota_fiscal.id])
         await self.session.commit()
         await self.session.refresh(nota_fiscal)
         return nota_fiscal
 
+    async def create_many(self, notas: list[dict]) -> list[NotaFiscal]:
+        """
+        Insere várias notas fiscais em uma única transação usando
+        INSERT de múltiplas linhas com RETURNING
+        """
+        if not notas:
+            return []
+
+        emitente_ids, destinatario_ids = await self._party_ids(
+            [nota['cnpj_emitente'] for nota in notas],
+            [nota['cpf_ou_cnpj_destinatario'] for nota in notas],
+        )
+        notas = [
+            {
+                **nota,
+                'emitente_id': emitente_ids.get(
+                    document_key(nota['cnpj_emitente'])
+                ),
+                'destinatario_id': destinatario_ids.get(
+                    document_key(nota['cpf_ou_cnpj_destinatario'])
+                ),
+            }
+            for nota in notas
+        ]
+
+        result = await self.session.scalars(
+            insert(NotaFiscal).returning(NotaFiscal), notas
+        )
+        created = list(result.all())
+        await self._add_to_rollup([nota.id for nota in created])
+        await self.session.commit()
+        return created
+
+    async def _party_ids(
+        self, cnpjs: Iterable[str], documentos: Iterable[str]
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """
+        Ids dos emitentes e destinatários cadastrados para os documentos
+        informados, indexados pelo documento normalizado (document_key);
+        com mais de um cadastro, o menor id, como em _party_id
+        """
+        digits = EmitenteModel.cnpj_digits
+        emitentes = await self.session.execute(
+            select(digits, func.min(EmitenteModel.id))
+            .where(digits.in_({document_key(c) for c in cnpjs}))
+            .group_by(digits)
+        )
+        digits = DestinatarioModel.cpf_cnpj_digits
+        destinatarios = await self.session.execute(
+            select(digits, func.min(DestinatarioModel.id))
+            .where(digits.in_({document_key(d) for d in documentos}))
+            .group_by(digits)
+        )
+        return (
+            dict(emitentes.tuples().all()),
+            dict(destinatarios.tuples().all()),
+        )
+
+    async def _add_to_rollup(self, nota_ids: list[int]) -> None:
+        """
+        Soma as notas recém-inseridas aos totais diários por emitente,
+        na mesma transação da inserção (INSERT ... ON CONFLICT DO UPDATE)
+        """
+        if not nota_ids:
+            return
+
+        stmt = pg_insert(NotaFiscalDailyTotal).from_select(
+            ['cnpj_emitente', 'dia', 'quantidade', *ROLLUP_FIELDS],
+            _daily_totals(NotaFiscal.id.in_(nota_ids)),
+        )
+        totals = NotaFiscalDailyTotal.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_nota_fiscal_daily_totals',
+            set_={
+                'updated_at': func.now(),
+                **{
+                    field: totals[field] + stmt.excluded[field]
+                    for field in ('quantidade', *ROLLUP_FIELDS)
+                },
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def rebuild_totals(self, start: date, end: date) -> int:
+        """
+        Recalcula do zero os totais diários no intervalo [start, end) a
+        partir de nota_fiscal, em uma única transação. Retorna a
+        quantidade de linhas (emitente, dia) gravadas.
+        """
+        # SHARE ROW EXCLUSIVE faz as inserções concorrentes esperarem
+        # no _add_to_rollup até o commit: nenhuma nota é somada duas
+        # vezes nem perdida entre o DELETE e o INSERT
+        await self.session.execute(
+            text(
+                f'LOCK TABLE {NotaFiscalDailyTotal.__tablename__} '
+                'IN SHARE ROW EXCLUSIVE MODE'
+            )
+        )
+        await self.session.execute(
+            delete(NotaFiscalDailyTotal).where(
+                NotaFiscalDailyTotal.dia >= start,
+                NotaFiscalDailyTotal.dia < end,
+            )
+        )
+
+        aggregated = _daily_totals(
+            NotaFiscal.created_at >= datetime.combine(start, time.min),
+            NotaFiscal.created_at < datetime.combine(end, time.min),
+        )
+        result = await self.session.execute(
+            insert(NotaFiscalDailyTotal).from_select(
+                ['cnpj_emitente', 'dia', 'quantidade', *ROLLUP_FIELDS],
+                aggregated,
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def totals(
+        self, start: date, end: date, cnpj_emitente: str | None = None
+    ) -> Sequence:
+        """
+        Soma os totais diários no intervalo [start, end) por emitente,
+        lendo apenas a tabela de rollup. O CNPJ do filtro é comparado
+        na forma de document_key, com ou sem pontuação.
+        """
+        query = (
+            select(
+                NotaFiscalDailyTotal.cnpj_emitente,
+                func.sum(NotaFiscalDailyTotal.quantidade).label('quantidade'),
+                *(
+                    func.sum(getattr(NotaFiscalDailyTotal, field)).label(field)
+                    for field in ROLLUP_FIELDS
+                ),
+            )
+            .where(
+                NotaFiscalDailyTotal.dia >= start,
+                NotaFiscalDailyTotal.dia < end,
+            )
+            .group_by(NotaFiscalDailyTotal.cnpj_emitente)
+            .order_by(NotaFiscalDailyTotal.cnpj_emitente)
+        )
+        if cnpj_emitente:
+            query = query.where(
+                NotaFiscalDailyTotal.cnpj_emitente
+                == document_key(cnpj_emitente)
+            )
+
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
     async def get_by_id(self, nota_fiscal_id: int):
         return await self.session.get(NotaFiscal, nota_fiscal_id)
 
-    async def list(self):
-        query = select(NotaFiscal)
-        result = await self.session.execute(query)
-        return result.scalars().all()
+    async def get_many(self, nota_fiscal_ids: Iterable[int]) -> Sequence:
+        """Notas fiscais dos ids informados, em qualquer ordem"""
+        result = await self.session.scalars(
+            select(NotaFiscal).where(NotaFiscal.id.in_(nota_fiscal_ids))
+        )
+        return result.all()
+
+    async def get_with_parties(self, nota_fiscal_id: int):
+        """
+        Nota fiscal com o emitente e o destinatário cadastrados,
+        carregados na mesma consulta (LEFT JOIN)
+        """
+        query = (
+            select(NotaFiscal)
+            .options(
+                joinedload(NotaFiscal.emitente),
+                joinedload(NotaFiscal.destinatario),
+            )
+            .where(NotaFiscal.id == nota_fiscal_id)
+        )
+        return await self.session.scalar(query)
+
+    async def list(
+        self,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        emitente_id: int | None = None,
+        destinatario_id: int | None = None,
+    ) -> tuple[Sequence[NotaFiscal], bool]:
+        """
+        Lista notas fiscais paginadas por keyset em (created_at, id).
+        limit: tamanho máximo da página
+        after: chave (created_at, id) do último item da página anterior
+        emitente_id/destinatario_id: filtram pelas chaves estrangeiras
+        Retorna os itens da página e se existe uma próxima página
+        """
+        query = (
+            select(NotaFiscal)
+            .order_by(NotaFiscal.created_at, NotaFiscal.id)
+            .limit(limit + 1)
+        )
+        if emitente_id is not None:
+            query = query.where(NotaFiscal.emitente_id == emitente_id)
+        if destinatario_id is not None:
+            query = query.where(NotaFiscal.destinatario_id == destinatario_id)
+        if after is not None:
+            query = query.where(
+                tuple_(NotaFiscal.created_at, NotaFiscal.id) > tuple_(*after)
+            )
+
+        result = await self.session.scalars(query)
+        notas = list(result.all())
+        return notas[:limit], len(notas) > limit
+
+    async def stream(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> AsyncIterator[NotaFiscal]:
+        """
+        Percorre as notas fiscais usando um cursor do lado do
+        servidor, buscando `chunk_size` linhas por vez.
+        start/end: filtra created_at no intervalo [start, end)
+        """
+        query = (
+            select(NotaFiscal)
+            .order_by(NotaFiscal.created_at, NotaFiscal.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if start is not None:
+            query = query.where(NotaFiscal.created_at >= start)
+        if end is not None:
+            query = query.where(NotaFiscal.created_at < end)
+
+        result = await self.session.stream_scalars(query)
+        async for nota in result:
+            yield nota
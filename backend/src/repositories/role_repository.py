@@ -1,13 +1,12 @@
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.role_model import RoleModel as Role
+from src.repositories.base import BaseRepository
 from src.schemas.role_schema import RoleUpdate, RoleStatusChanger
 
 
-class RoleRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class RoleRepository(BaseRepository[Role]):
+    model = Role
 
     async def create(self, role: Role) -> Role:
         self.session.add(role)
@@ -16,11 +15,6 @@ class RoleRepository:
 
         return role
 
-    async def get_by_id(self, role_id: int) -> Role | None:
-        return await self.session.scalar(
-            select(Role).where(Role.id == role_id)
-        )
-
     async def get_by_name(self, role_name: str) -> Role | None:
         return await self.session.scalar(
             select(Role).where(Role.name == role_name)
@@ -39,17 +33,5 @@ class RoleRepository:
     async def update(
         self, role_id: int, role_update: RoleUpdate | RoleStatusChanger
     ) -> Role | None:
-        role = await self.get_by_id(role_id)
-        if not role:
-            return None
-
         data = role_update.model_dump(exclude_unset=True)
-
-        for field, value in data.items():
-            if hasattr(role, field):
-                setattr(role, field, value)
-
-        await self.session.commit()
-        await self.session.refresh(role)
-
-        return role
+        return await self.update_by_id(role_id, data)
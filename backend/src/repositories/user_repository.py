@@ -1,16 +1,18 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 
+from sqlalchemy import func, select
+
+from src.cache import user_cache
 from src.models.user_model import UserModel as User
+from src.repositories.base import BaseRepository
 from src.schemas.user_schema import (
     UserStatusChanger,
     UserUpdate,
 )
 
 
-class UserRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class UserRepository(BaseRepository[User]):
+    model = User
 
     async def create(self, user: User) -> User:
         self.session.add(user)
@@ -19,11 +21,6 @@ class UserRepository:
 
         return user
 
-    async def get_by_id(self, user_id: int) -> User | None:
-        return await self.session.scalar(
-            select(User).where(User.id == user_id)
-        )
-
     async def get_by_email(self, user_email: str) -> User | None:
         return await self.session.scalar(
             select(User).where(User.email == user_email)
@@ -38,20 +35,42 @@ class UserRepository:
         result = await self.session.scalars(select(User))
         return result.all()
 
+    async def list_version(self) -> tuple[int, datetime | None]:
+        """Quantidade de usuários e a última alteração, para a ETag"""
+        result = await self.session.execute(
+            select(func.count(), func.max(User.updated_at))
+        )
+        return tuple(result.one())
+
     async def update(
         self, user_id: int, user_update: UserUpdate | UserStatusChanger
     ) -> User | None:
-        user = await self.get_by_id(user_id)
-        if not user:
-            return None
-
         data = user_update.model_dump(exclude_unset=True)
+        if not data:
+            return await self.get_by_id(user_id)
 
-        for field, value in data.items():
-            if hasattr(user, field):
-                setattr(user, field, value)
+        # O subselect no RETURNING enxerga a linha antes do UPDATE
+        previous_email = (
+            select(User.email).where(User.id == user_id).scalar_subquery()
+        )
+        row = await self._update_returning(
+            user_id, data, extra=(previous_email,)
+        )
+        if row is None:
+            return None
 
-        await self.session.commit()
-        await self.session.refresh(user)
+        user, previous = row
+        # Remove o usuário do cache de autenticação para que mudanças
+        # como a desativação valham já na próxima requisição
+        user_cache.invalidate(previous)
+        user_cache.invalidate(user.email)
 
         return user
+
+    async def set_active(
+        self, user_id: int, active: bool
+    ) -> tuple[User | None, bool]:
+        user, changed = await super().set_active(user_id, active)
+        if changed:
+            user_cache.invalidate(user.email)
+        return user, changed
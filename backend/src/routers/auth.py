@@ -41,7 +41,7 @@ async def login_for_access_token(
     if not user:
         raise INCORRECT_FIELDS
 
-    if not PasswordHasher.check(form_data.password, user.password):
+    if not await PasswordHasher.check_async(form_data.password, user.password):
         raise INCORRECT_FIELDS
 
     access_token = create_access_token({'sub': user.email})
@@ -1,12 +1,25 @@
 from http import HTTPStatus
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_session
-from src.models.destinatario_model import DestinatarioModel
+from src.conditional import (
+    entity_etag,
+    list_etag,
+    not_modified,
+    validator_headers,
+)
+from src.db.database import get_read_session, get_session
 from src.models.user_model import UserModel
+from src.repositories.base import ConflictMode
 from src.repositories.destinatario_repository import DestinatarioRepository
 from src.schemas.destinatario_schema import (
     DestinatarioCreate,
@@ -14,7 +27,10 @@ from src.schemas.destinatario_schema import (
     DestinatarioRead,
     DestinatarioUpdate,
 )
+from src.search_index import destinatario_index
 from src.security import get_current_user
+from src.serialization import json_response
+from src.settings import settings
 
 router = APIRouter(prefix='/destinatarios', tags=['destinatarios'])
 
@@ -25,9 +41,19 @@ def get_destinatario_repo(
     return DestinatarioRepository(session)
 
 
+def get_destinatario_read_repo(
+    session: AsyncSession = Depends(get_read_session),
+) -> DestinatarioRepository:
+    """Repositório das rotas de leitura, na réplica quando configurada"""
+    return DestinatarioRepository(session)
+
+
 DestinatarioRepo = Annotated[
     DestinatarioRepository, Depends(get_destinatario_repo)
 ]
+DestinatarioReadRepo = Annotated[
+    DestinatarioRepository, Depends(get_destinatario_read_repo)
+]
 
 
 @router.post(
@@ -35,32 +61,46 @@ DestinatarioRepo = Annotated[
 )
 async def create_destinatario(
     destinatario_in: DestinatarioCreate,
+    response: Response,
     repo: DestinatarioRepo,
+    on_conflict: ConflictMode = Query(
+        'reject', description='Ação quando o CPF/CNPJ já está cadastrado'
+    ),
     current_user: UserModel = Depends(get_current_user),
 ):
-    if await repo.get_by_cpf_cnpj(destinatario_in.cpf_cnpj):
+    destinatario, created = await repo.create(
+        destinatario_in.model_dump(), on_conflict
+    )
+
+    if not destinatario:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='Destinatario with this CPF/CNPJ already exists!',
         )
 
-    destinatario = DestinatarioModel(
-        name=destinatario_in.name,
-        cpf_cnpj=destinatario_in.cpf_cnpj,
-        phone=destinatario_in.phone,
-        email=destinatario_in.email,
-    )
+    if not created:
+        response.status_code = HTTPStatus.OK
 
-    return await repo.create(destinatario)
+    return destinatario
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=DestinatarioList)
 async def list_destinatarios(
-    repo: DestinatarioRepo,
+    request: Request,
+    repo: DestinatarioReadRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
+    count, last_modified = await repo.list_version()
+    headers = validator_headers(
+        list_etag('destinatarios', count, last_modified), last_modified
+    )
+    if response := not_modified(request, headers):
+        return response
+
     destinatarios = await repo.list_destinatarios()
-    return {'destinatarios': destinatarios}
+    return json_response(
+        DestinatarioList, {'destinatarios': destinatarios}, headers=headers
+    )
 
 
 @router.get(
@@ -68,19 +108,24 @@ async def list_destinatarios(
 )
 async def search_destinatarios(
     q: str = Query(..., min_length=2, description='Termo de busca'),
-    repo: DestinatarioRepository = Depends(get_destinatario_repo),
+    limit: int = Query(
+        settings.SEARCH_DEFAULT_LIMIT, ge=1, le=settings.SEARCH_MAX_LIMIT
+    ),
+    repo: DestinatarioRepository = Depends(get_destinatario_read_repo),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
     Busca destinatários por nome ou CPF/CNPJ para autocomplete.
-    Retorna no máximo 10 resultados.
+    Com o índice em memória carregado, a busca é por início de palavra
+    do nome ou do documento e não consulta o banco; no banco, é por
+    trecho do nome ou do documento, ordenada por similaridade.
     """
-    # Remove caracteres especiais do documento para busca
-    q_clean = q.replace('.', '').replace('/', '').replace('-', '')
-
-    # Busca por nome ou documento
-    destinatarios = await repo.search(q, q_clean, limit=10)
+    if settings.SEARCH_INDEX_ENABLED and destinatario_index.loaded:
+        return json_response(
+            List[DestinatarioRead], destinatario_index.search(q, limit)
+        )
 
+    destinatarios = await repo.search(q, limit=limit)
     return destinatarios
 
 
@@ -91,7 +136,8 @@ async def search_destinatarios(
 )
 async def get_destinatario_by_id(
     destinatario_id: int,
-    repo: DestinatarioRepo,
+    request: Request,
+    repo: DestinatarioReadRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
     db_destinatario = await repo.get_by_id(destinatario_id)
@@ -102,7 +148,13 @@ async def get_destinatario_by_id(
             detail='Destinatario with this ID does not exist!',
         )
 
-    return db_destinatario
+    headers = validator_headers(
+        entity_etag(db_destinatario), db_destinatario.updated_at
+    )
+    if response := not_modified(request, headers):
+        return response
+
+    return json_response(DestinatarioRead, db_destinatario, headers=headers)
 
 
 @router.patch(
@@ -116,15 +168,14 @@ async def update_destinatario(
     repo: DestinatarioRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_destinatario = await repo.get_by_id(destinatario_id)
+    updated_destinatario = await repo.update(destinatario_id, destinatario_in)
 
-    if not db_destinatario:
+    if not updated_destinatario:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Destinatario with this ID does not exist!',
         )
 
-    updated_destinatario = await repo.update(destinatario_id, destinatario_in)
     return updated_destinatario
 
 
@@ -138,7 +189,7 @@ async def deactivate_destinatario(
     repo: DestinatarioRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_destinatario = await repo.get_by_id(destinatario_id)
+    db_destinatario, changed = await repo.set_active(destinatario_id, False)
 
     if not db_destinatario:
         raise HTTPException(
@@ -146,15 +197,13 @@ async def deactivate_destinatario(
             detail='Destinatario with this ID does not exist!',
         )
 
-    if not db_destinatario.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Destinatario already deactivated',
         )
 
-    update_data = DestinatarioUpdate(active=False)
-    updated_destinatario = await repo.update(destinatario_id, update_data)
-    return updated_destinatario
+    return db_destinatario
 
 
 @router.patch(
@@ -167,7 +216,7 @@ async def activate_destinatario(
     repo: DestinatarioRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_destinatario = await repo.get_by_id(destinatario_id)
+    db_destinatario, changed = await repo.set_active(destinatario_id, True)
 
     if not db_destinatario:
         raise HTTPException(
@@ -175,12 +224,10 @@ async def activate_destinatario(
             detail='Destinatario with this ID does not exist!',
         )
 
-    if db_destinatario.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Destinatario already activated',
         )
 
-    update_data = DestinatarioUpdate(active=True)
-    updated_destinatario = await repo.update(destinatario_id, update_data)
-    return updated_destinatario
+    return db_destinatario
@@ -1,21 +1,36 @@
 from http import HTTPStatus
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.security import get_current_user
-from src.db.database import get_session
-from src.models.emitente_model import EmitenteModel
+from src.conditional import (
+    entity_etag,
+    list_etag,
+    not_modified,
+    validator_headers,
+)
+from src.db.database import get_read_session, get_session
 from src.models.user_model import UserModel
+from src.repositories.base import ConflictMode
 from src.repositories.emitente_repository import EmitenteRepository
 from src.schemas.emitente_schema import (
     EmitenteCreate,
     EmitenteRead,
-    EmitenteStatusChanger,
     EmitenteToList,
     EmitenteUpdate,
 )
+from src.search_index import emitente_index
+from src.serialization import json_response
+from src.settings import settings
 
 router = APIRouter(prefix='/emitentes', tags=['emitentes'])
 
@@ -26,37 +41,62 @@ def get_emitente_repo(
     return EmitenteRepository(session)
 
 
+def get_emitente_read_repo(
+    session: AsyncSession = Depends(get_read_session),
+) -> EmitenteRepository:
+    """Repositório das rotas de leitura, na réplica quando configurada"""
+    return EmitenteRepository(session)
+
+
 EmitenteRepo = Annotated[EmitenteRepository, Depends(get_emitente_repo)]
+EmitenteReadRepo = Annotated[
+    EmitenteRepository, Depends(get_emitente_read_repo)
+]
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=EmitenteRead)
 async def create_emitente(
     emitente_in: EmitenteCreate,
+    response: Response,
     repo: EmitenteRepo,
+    on_conflict: ConflictMode = Query(
+        'reject', description='Ação quando o CNPJ já está cadastrado'
+    ),
     current_user: UserModel = Depends(get_current_user),
 ):
-    if await repo.get_by_cnpj(emitente_in.cnpj):
+    emitente, created = await repo.create(
+        emitente_in.model_dump(), on_conflict
+    )
+
+    if not emitente:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='Emitente with this CNPJ already exists!',
         )
 
-    emitente = EmitenteModel(
-        name=emitente_in.name,
-        cnpj=emitente_in.cnpj,
-        phone=emitente_in.phone,
-        email=emitente_in.email,
-    )
+    if not created:
+        response.status_code = HTTPStatus.OK
 
-    return await repo.create(emitente)
+    return emitente
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=EmitenteToList)
 async def list_emitentes(
-    repo: EmitenteRepo, current_user: UserModel = Depends(get_current_user)
+    request: Request,
+    repo: EmitenteReadRepo,
+    current_user: UserModel = Depends(get_current_user),
 ):
+    count, last_modified = await repo.list_version()
+    headers = validator_headers(
+        list_etag('emitentes', count, last_modified), last_modified
+    )
+    if response := not_modified(request, headers):
+        return response
+
     emitentes = await repo.list_emitentes()
-    return {'emitentes': emitentes}
+    return json_response(
+        EmitenteToList, {'emitentes': emitentes}, headers=headers
+    )
 
 
 @router.get(
@@ -64,15 +104,24 @@ async def list_emitentes(
 )
 async def search_emitentes(
     q: str = Query(..., min_length=2, description='Termo de busca'),
-    repo: EmitenteRepository = Depends(get_emitente_repo),
+    limit: int = Query(
+        settings.SEARCH_DEFAULT_LIMIT, ge=1, le=settings.SEARCH_MAX_LIMIT
+    ),
+    repo: EmitenteRepository = Depends(get_emitente_read_repo),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
     Busca emitentes por nome ou CNPJ para autocomplete.
-    Retorna no máximo 10 resultados.
+    Com o índice em memória carregado, a busca é por início de palavra
+    do nome ou do documento e não consulta o banco; no banco, é por
+    trecho do nome ou do documento, ordenada por similaridade.
     """
-    q_clean = q.replace('.', '').replace('/', '').replace('-', '')
-    emitentes = await repo.search(q, q_clean, limit=10)
+    if settings.SEARCH_INDEX_ENABLED and emitente_index.loaded:
+        return json_response(
+            List[EmitenteRead], emitente_index.search(q, limit)
+        )
+
+    emitentes = await repo.search(q, limit=limit)
     return emitentes
 
 
@@ -81,7 +130,8 @@ async def search_emitentes(
 )
 async def get_emitente_by_id(
     emitente_id: int,
-    repo: EmitenteRepo,
+    request: Request,
+    repo: EmitenteReadRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
     db_emitente = await repo.get_by_id(emitente_id)
@@ -92,7 +142,13 @@ async def get_emitente_by_id(
             detail='Emitente with this ID does not exist!',
         )
 
-    return db_emitente
+    headers = validator_headers(
+        entity_etag(db_emitente), db_emitente.updated_at
+    )
+    if response := not_modified(request, headers):
+        return response
+
+    return json_response(EmitenteRead, db_emitente, headers=headers)
 
 
 @router.patch(
@@ -104,15 +160,14 @@ async def update_emitente(
     repo: EmitenteRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_emitente = await repo.get_by_id(emitente_id)
+    updated_emitente = await repo.update(emitente_id, emitente_in)
 
-    if not db_emitente:
+    if not updated_emitente:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Emitente with this ID does not exist!',
         )
 
-    updated_emitente = await repo.update(emitente_id, emitente_in)
     return updated_emitente
 
 
@@ -126,7 +181,7 @@ async def deactivate_emitente(
     repo: EmitenteRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_emitente = await repo.get_by_id(emitente_id)
+    db_emitente, changed = await repo.set_active(emitente_id, False)
 
     if not db_emitente:
         raise HTTPException(
@@ -134,15 +189,13 @@ async def deactivate_emitente(
             detail='Emitente with this ID does not exist!',
         )
 
-    if not db_emitente.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Emitente already deactivated',
         )
 
-    update_data = EmitenteStatusChanger(active=False)
-    updated_emitente = await repo.update(emitente_id, update_data)
-    return updated_emitente
+    return db_emitente
 
 
 @router.patch(
@@ -155,7 +208,7 @@ async def activate_emitente(
     repo: EmitenteRepo,
     current_user: UserModel = Depends(get_current_user),
 ):
-    db_emitente = await repo.get_by_id(emitente_id)
+    db_emitente, changed = await repo.set_active(emitente_id, True)
 
     if not db_emitente:
         raise HTTPException(
@@ -163,12 +216,10 @@ async def activate_emitente(
             detail='Emitente with this ID does not exist!',
         )
 
-    if db_emitente.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Emitente already activated',
         )
 
-    update_data = EmitenteStatusChanger(active=True)
-    updated_emitente = await repo.update(emitente_id, update_data)
-    return updated_emitente
+    return db_emitente
@@ -0,0 +1,110 @@
+from http import HTTPStatus
+from math import ceil
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import get_session
+from src.jobs.handlers import JOB_HANDLERS
+from src.models.job_model import JobModel
+from src.models.user_model import UserModel
+from src.repositories.job_repository import JobRepository
+from src.schemas.job_schema import JobCreate, JobRead, JobResult
+from src.security import get_current_user
+from src.serialization import json_response
+from src.settings import settings
+
+router = APIRouter(prefix='/jobs', tags=['jobs'])
+
+FINISHED_STATUSES = ('succeeded', 'failed')
+
+
+def get_job_repo(
+    session: AsyncSession = Depends(get_session),
+) -> JobRepository:
+    return JobRepository(session)
+
+
+async def _get_user_job(
+    job_id: int, repo: JobRepository, user: UserModel
+) -> JobModel:
+    # Cada usuário só enxerga as próprias tarefas
+    job = await repo.get_for_user(job_id, user.id)
+    if not job:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Job with this ID does not exist!',
+        )
+    return job
+
+
+@router.post('/', status_code=HTTPStatus.ACCEPTED, response_model=JobRead)
+async def submit_job(
+    job_in: JobCreate,
+    repo: JobRepository = Depends(get_job_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Coloca a tarefa na fila e responde na hora; o andamento é
+    consultado em GET /jobs/{id} e o resultado em GET /jobs/{id}/result
+    """
+    handler = JOB_HANDLERS.get(job_in.kind)
+    if handler is None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f'Unknown job kind. Available: {", ".join(JOB_HANDLERS)}',
+        )
+
+    try:
+        payload = handler.payload_schema.model_validate(job_in.payload)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=exc.errors(include_url=False, include_context=False),
+        )
+
+    job = await repo.submit(
+        job_in.kind,
+        payload.model_dump(mode='json'),
+        current_user.id,
+        settings.JOB_MAX_ATTEMPTS,
+    )
+    return json_response(
+        JobRead,
+        job,
+        status_code=HTTPStatus.ACCEPTED,
+        headers={'Location': f'{router.prefix}/{job.id}'},
+    )
+
+
+@router.get('/{job_id}', response_model=JobRead)
+async def get_job(
+    job_id: int,
+    repo: JobRepository = Depends(get_job_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    job = await _get_user_job(job_id, repo, current_user)
+    return json_response(JobRead, job)
+
+
+@router.get('/{job_id}/result', response_model=JobResult)
+async def get_job_result(
+    job_id: int,
+    repo: JobRepository = Depends(get_job_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Resultado da tarefa concluída (ou o erro da última tentativa,
+    quando ela falhou); 409 enquanto ainda está na fila ou em execução
+    """
+    job = await _get_user_job(job_id, repo, current_user)
+    if job.status not in FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Job has not finished yet',
+            headers={
+                'Retry-After': str(ceil(settings.JOB_POLL_INTERVAL_SECONDS))
+            },
+        )
+    return json_response(JobResult, job)
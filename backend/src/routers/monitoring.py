@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.cache import user_cache
+from src.db.database import pool_stats, replica_pool_stats
+from src.metrics import render_prometheus
+from src.models.user_model import UserModel
+from src.search_index import search_indexes
+from src.security import get_current_user
+
+router = APIRouter(prefix='/monitoring', tags=['monitoring'])
+# /metrics fica na raiz, onde o Prometheus procura por padrão
+metrics_router = APIRouter(tags=['monitoring'])
+
+
+@router.get('/cache', status_code=HTTPStatus.OK)
+async def get_cache_stats(
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Estatísticas dos caches e dos índices de autocomplete em memória
+    deste worker.
+    """
+    return {
+        'users': user_cache.stats(),
+        'search': {
+            name: index.stats() for name, index in search_indexes.items()
+        },
+    }
+
+
+@router.get('/pool', status_code=HTTPStatus.OK)
+async def get_pool_stats(
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Estado do pool de conexões deste worker: conexões em uso,
+    overflow e tempo de espera no checkout.
+    """
+    stats = {'database': pool_stats()}
+    if replica := replica_pool_stats():
+        stats['replica'] = replica
+    return stats
+
+
+@metrics_router.get('/metrics', response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Métricas deste worker no formato de exposição do Prometheus.
+    """
+    pool = pool_stats()
+    cache = user_cache.stats()
+
+    gauges = {
+        'db_pool_size': pool['size'],
+        'db_pool_in_use': pool['in_use'],
+        'db_pool_checked_in': pool['checked_in'],
+        'db_pool_overflow': pool['overflow'],
+        'user_cache_size': cache['size'],
+    }
+    counters = {
+        'db_pool_checkouts_total': pool['checkouts'],
+        'db_pool_timeouts_total': pool['timeouts'],
+        'db_pool_checkout_wait_seconds_total': pool['wait_total_ms'] / 1000,
+        'user_cache_hits_total': cache['hits'],
+        'user_cache_misses_total': cache['misses'],
+    }
+    if replica := replica_pool_stats():
+        gauges['db_replica_pool_in_use'] = replica['in_use']
+        gauges['db_replica_pool_checked_in'] = replica['checked_in']
+        counters['db_replica_pool_timeouts_total'] = replica['timeouts']
+    return render_prometheus(gauges, counters)
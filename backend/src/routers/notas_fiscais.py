@@ -1,21 +1,73 @@
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from datetime import date, datetime, time, timedelta
 from http import HTTPStatus
+from typing import Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_session
+from src.conditional import not_modified, validator_headers
+from src.db.database import get_read_session, get_session, new_session
+from src.documents.cache import danfe_cache
+from src.lazy import lazy_import
 from src.models.notaFiscal_model import NotaFiscal
 from src.models.user_model import UserModel
+from src.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
 from src.repositories.nota_fiscal_repository import NotaFiscalRepository
 from src.schemas.nota_fiscal_schema import (
+    NotaFiscalBatchCreate,
+    NotaFiscalBatchResult,
     NotaFiscalCreate,
+    NotaFiscalDetail,
+    NotaFiscalImportResult,
     NotaFiscalList,
+    NotaFiscalPdfBatch,
     NotaFiscalRead,
+    NotaFiscalTotalsReport,
 )
 from src.security import get_current_user
+from src.serialization import json_response
+from src.settings import settings
+
+# A importação de XML (multiprocessing, ElementTree) só é carregada no
+# primeiro upload
+nfe_xml = lazy_import('src.importers.nfe_xml')
+# O layout do DANFE e o pool de processos só são montados no primeiro
+# PDF que não está no cache
+danfe = lazy_import('src.documents.danfe')
 
 router = APIRouter(prefix='/nfse', tags=['notasfiscais'])
 
+EXPORT_COLUMNS = tuple(NotaFiscalRead.model_fields)
+# Quantidade de notas acumuladas antes de enviar um pedaço do streaming
+EXPORT_FLUSH_ROWS = 500
+# Bytes lidos por vez ao copiar um arquivo enviado para o disco
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+PDF_RESPONSE = {200: {'content': {'application/pdf': {}}}}
+ZIP_RESPONSE = {200: {'content': {'application/zip': {}}}}
+
 
 def get_nota_fiscal_repo(
     session: AsyncSession = Depends(get_session),
@@ -23,6 +75,13 @@ def get_nota_fiscal_repo(
     return NotaFiscalRepository(session)
 
 
+def get_nota_fiscal_read_repo(
+    session: AsyncSession = Depends(get_read_session),
+) -> NotaFiscalRepository:
+    """Repositório das rotas de leitura, na réplica quando configurada"""
+    return NotaFiscalRepository(session)
+
+
 @router.post(
     '/register', status_code=HTTPStatus.CREATED, response_model=NotaFiscalRead
 )
@@ -38,9 +97,381 @@ async def create_nota_fiscal(
     return await repo.create(nota_fiscal)
 
 
+@router.post(
+    '/batch',
+    status_code=HTTPStatus.CREATED,
+    response_model=NotaFiscalBatchResult,
+)
+async def create_notas_fiscais_batch(
+    batch_in: NotaFiscalBatchCreate,
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Registra um lote de notas fiscais em uma única transação.
+    Itens inválidos não interrompem o lote e são reportados
+    com o seu índice na lista enviada.
+    """
+    valid_notas = []
+    errors = []
+
+    for index, item in enumerate(batch_in.notas_fiscais):
+        try:
+            nota_in = NotaFiscalCreate.model_validate(item)
+        except ValidationError as exc:
+            item_errors = exc.errors(include_url=False, include_context=False)
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        valid_notas.append(nota_in.model_dump())
+
+    created = await repo.create_many(valid_notas)
+    return {'created': created, 'errors': errors}
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f'File larger than {settings.IMPORT_MAX_BYTES} bytes',
+    )
+
+
+def _save_upload(upload: UploadFile) -> str:
+    """Copia o arquivo enviado para o disco, até IMPORT_MAX_BYTES"""
+    if upload.size is not None and upload.size > settings.IMPORT_MAX_BYTES:
+        raise _file_too_large()
+
+    suffix = os.path.splitext(upload.filename or '')[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as target:
+        copied = 0
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            copied += len(chunk)
+            if copied > settings.IMPORT_MAX_BYTES:
+                break
+            target.write(chunk)
+    if copied > settings.IMPORT_MAX_BYTES:
+        os.remove(target.name)
+        raise _file_too_large()
+    return target.name
+
+
+@router.post(
+    '/import',
+    status_code=HTTPStatus.CREATED,
+    response_model=NotaFiscalImportResult,
+)
+async def import_notas_fiscais(
+    file: UploadFile,
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Importa notas fiscais de um XML de NF-e ou de um ZIP com vários XMLs.
+    O parsing é distribuído em um pool de processos e as notas são
+    gravadas em lotes.
+    """
+    path = await run_in_threadpool(_save_upload, file)
+    try:
+        return await nfe_xml.import_nfe_files(
+            [path],
+            repo,
+            nfe_xml.get_process_pool(),
+            nfe_xml.get_manager(),
+        )
+    finally:
+        os.remove(path)
+
+
+class _ZipStream(io.RawIOBase):
+    """Destino sem seek do ZipFile, esvaziado a cada arquivo incluído"""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    @staticmethod
+    def writable() -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _zip_files(files: list[tuple[str, os.PathLike]]) -> Iterator[bytes]:
+    """
+    ZIP gerado em pedaços: cada PDF é enviado assim que é incluído, e a
+    memória usada é a de um PDF, qualquer que seja o tamanho do lote.
+    Gerador síncrono: o StreamingResponse o consome em uma thread.
+    """
+    stream = _ZipStream()
+    # Os PDFs já são comprimidos; o ZIP apenas os agrupa
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as archive:
+        for name, path in files:
+            archive.write(path, name)
+            yield stream.pop()
+    yield stream.pop()
+
+
+@router.post('/pdf/batch', response_class=Response, responses=ZIP_RESPONSE)
+async def get_notas_fiscais_pdf_batch(
+    batch_in: NotaFiscalPdfBatch,
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    DANFEs de várias notas fiscais em um ZIP. Os PDFs que ainda não
+    estão no cache são gerados em paralelo no pool de processos.
+    """
+    nota_ids = list(dict.fromkeys(batch_in.ids))
+    notas = {nota.id: nota for nota in await repo.get_many(nota_ids)}
+
+    missing = [nota_id for nota_id in nota_ids if nota_id not in notas]
+    if missing:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=(
+                'Notas fiscais with these IDs do not exist: '
+                f'{", ".join(map(str, missing))}'
+            ),
+        )
+
+    keys = {
+        nota.id: danfe_cache.key(nota.id, nota.updated_at)
+        for nota in notas.values()
+    }
+    await danfe.render_many([
+        danfe.nota_snapshot(notas[nota_id])
+        for nota_id, key in keys.items()
+        if danfe_cache.get(key) is None
+    ])
+
+    files = [
+        (f'danfe-{nota_id}.pdf', danfe_cache.path(keys[nota_id]))
+        for nota_id in nota_ids
+    ]
+    return StreamingResponse(
+        _zip_files(files),
+        media_type='application/zip',
+        headers={'Content-Disposition': 'attachment; filename="danfe.zip"'},
+    )
+
+
 @router.get('/', response_model=NotaFiscalList)
 async def list_notas_fiscais(
-    repo: NotaFiscalRepository = Depends(get_nota_fiscal_repo),
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_read_repo),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description='Cursor da próxima página'),
+    emitente_id: int | None = Query(None, description='Filtra pelo emitente'),
+    destinatario_id: int | None = Query(
+        None, description='Filtra pelo destinatário'
+    ),
 ):
-    notas = await repo.list()
-    return {'notas_fiscais': notas}
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+            )
+
+    notas, has_more = await repo.list(
+        limit,
+        after,
+        emitente_id=emitente_id,
+        destinatario_id=destinatario_id,
+    )
+
+    next_cursor = None
+    if has_more:
+        last = notas[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return json_response(
+        NotaFiscalList, {'notas_fiscais': notas, 'next_cursor': next_cursor}
+    )
+
+
+async def _stream_notas(
+    format_nota: Callable[[NotaFiscal], str],
+    start: datetime | None = None,
+    end: datetime | None = None,
+    header: str = '',
+) -> AsyncIterator[str]:
+    """
+    Corpo das respostas em streaming: as notas lidas com cursor do lado
+    do servidor, cada uma convertida por `format_nota`, enviadas em
+    pedaços de EXPORT_FLUSH_ROWS notas com memória constante
+    """
+    lines = [header] if header else []
+    # A sessão da dependência é fechada antes do corpo ser enviado, por
+    # isso o streaming abre a sua própria sessão
+    async with new_session() as session:
+        repo = NotaFiscalRepository(session)
+        async for nota in repo.stream(start=start, end=end):
+            lines.append(format_nota(nota))
+            if len(lines) >= EXPORT_FLUSH_ROWS:
+                yield ''.join(lines)
+                lines.clear()
+
+    yield ''.join(lines)
+
+
+def _ndjson_line(nota: NotaFiscal) -> str:
+    return NotaFiscalRead.model_validate(nota).model_dump_json() + '\n'
+
+
+def _csv_line(values: Iterable) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def _export_csv_line(nota: NotaFiscal) -> str:
+    row = []
+    for column in EXPORT_COLUMNS:
+        value = getattr(nota, column)
+        row.append(value.isoformat() if isinstance(value, datetime) else value)
+    return _csv_line(row)
+
+
+@router.get('/stream')
+async def stream_notas_fiscais(
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Transmite todas as notas fiscais em NDJSON (uma nota por linha),
+    lendo do banco com cursor do lado do servidor.
+    """
+    return StreamingResponse(
+        _stream_notas(_ndjson_line), media_type='application/x-ndjson'
+    )
+
+
+@router.get('/export')
+async def export_notas_fiscais(
+    export_format: Literal['csv', 'ndjson'] = Query('csv', alias='format'),
+    start_date: date | None = Query(None, description='Data inicial'),
+    end_date: date | None = Query(None, description='Data final (inclusa)'),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Exporta as notas fiscais do período em CSV ou NDJSON.
+    O corpo é enviado em pedaços à medida que as linhas são lidas do
+    cursor do servidor, mantendo a memória constante.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='start_date must be before end_date',
+        )
+
+    start = datetime.combine(start_date, time.min) if start_date else None
+    end = (
+        datetime.combine(end_date + timedelta(days=1), time.min)
+        if end_date
+        else None
+    )
+
+    if export_format == 'csv':
+        body = _stream_notas(
+            _export_csv_line, start, end, header=_csv_line(EXPORT_COLUMNS)
+        )
+        media_type = 'text/csv'
+    else:
+        body = _stream_notas(_ndjson_line, start, end)
+        media_type = 'application/x-ndjson'
+
+    filename = f'notas_fiscais.{export_format}'
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get('/reports/totals', response_model=NotaFiscalTotalsReport)
+async def get_totals_report(
+    year: int = Query(..., ge=2000, le=2999),
+    month: int | None = Query(None, ge=1, le=12),
+    cnpj_emitente: str | None = Query(None, max_length=18),
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_read_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Totais de valores e impostos por emitente no mês ou no ano,
+    calculados a partir dos totais diários pré-agregados.
+    """
+    if month is None:
+        start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    else:
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+
+    totals = await repo.totals(start, end, cnpj_emitente)
+    return {'year': year, 'month': month, 'totals': totals}
+
+
+@router.get('/{nota_fiscal_id}', response_model=NotaFiscalDetail)
+async def get_nota_fiscal(
+    nota_fiscal_id: int,
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_read_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Nota fiscal com os cadastros de emitente e destinatário"""
+    nota = await repo.get_with_parties(nota_fiscal_id)
+
+    if not nota:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Nota fiscal with this ID does not exist!',
+        )
+
+    return json_response(NotaFiscalDetail, nota)
+
+
+@router.get(
+    '/{nota_fiscal_id}/pdf',
+    response_class=FileResponse,
+    responses=PDF_RESPONSE,
+)
+async def get_nota_fiscal_pdf(
+    nota_fiscal_id: int,
+    request: Request,
+    repo: NotaFiscalRepository = Depends(get_nota_fiscal_read_repo),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    DANFE da nota fiscal em PDF, servido do cache em disco; o PDF só é
+    gerado na primeira requisição após cada alteração da nota
+    """
+    nota = await repo.get_by_id(nota_fiscal_id)
+
+    if not nota:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Nota fiscal with this ID does not exist!',
+        )
+
+    # A chave do cache identifica os bytes do PDF: ETag forte
+    key = danfe_cache.key(nota.id, nota.updated_at)
+    headers = validator_headers(f'"{key}"', nota.updated_at)
+    if response := not_modified(request, headers):
+        return response
+
+    path = danfe_cache.get(key)
+    if path is None:
+        await danfe.render_many([danfe.nota_snapshot(nota)])
+        path = danfe_cache.path(key)
+
+    return FileResponse(
+        path,
+        media_type='application/pdf',
+        filename=f'danfe-{nota.id}.pdf',
+        content_disposition_type='inline',
+        headers=headers,
+    )
@@ -1,20 +1,26 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_session
+from src.conditional import (
+    entity_etag,
+    list_etag,
+    not_modified,
+    validator_headers,
+)
+from src.db.database import get_read_session, get_session
 from src.models.user_model import UserModel
 from src.repositories.user_repository import UserRepository
 from src.schemas.user_schema import (
     UserCreate,
     UserList,
     UserRead,
-    UserStatusChanger,
     UserUpdate,
 )
 from src.security import PasswordHasher
+from src.serialization import json_response
 
 router = APIRouter(prefix='/users', tags=['users'])
 
@@ -30,7 +36,15 @@ def get_user_repository(
     return UserRepository(session)
 
 
+def get_user_read_repository(
+    session: AsyncSession = Depends(get_read_session),
+) -> UserRepository:
+    """Repositório das rotas de leitura, na réplica quando configurada"""
+    return UserRepository(session)
+
+
 UserRepo = Annotated[UserRepository, Depends(get_user_repository)]
+UserReadRepo = Annotated[UserRepository, Depends(get_user_read_repository)]
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=UserRead)
@@ -44,21 +58,29 @@ async def create_user(user_in: UserCreate, repo: UserRepo):
         name=user_in.name,
         email=user_in.email,
         phone=user_in.phone,
-        password=PasswordHasher.hash(user_in.password),
+        password=await PasswordHasher.hash_async(user_in.password),
     )
 
     return await repo.create(user)
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
-async def list_users(repo: UserRepo):
-    return {'users': await repo.list_users()}
+async def list_users(request: Request, repo: UserReadRepo):
+    count, last_modified = await repo.list_version()
+    headers = validator_headers(
+        list_etag('users', count, last_modified), last_modified
+    )
+    if response := not_modified(request, headers):
+        return response
+
+    users = await repo.list_users()
+    return json_response(UserList, {'users': users}, headers=headers)
 
 
 @router.get(
     '/id/{user_id}', status_code=HTTPStatus.OK, response_model=UserRead
 )
-async def get_user_by_id(user_id: int, repo: UserRepo):
+async def get_user_by_id(user_id: int, request: Request, repo: UserReadRepo):
     db_user = await repo.get_by_id(user_id)
 
     if not db_user:
@@ -66,12 +88,16 @@ async def get_user_by_id(user_id: int, repo: UserRepo):
             status_code=HTTPStatus.NOT_FOUND, detail='User not found'
         )
 
-    return db_user
+    headers = validator_headers(entity_etag(db_user), db_user.updated_at)
+    if response := not_modified(request, headers):
+        return response
+
+    return json_response(UserRead, db_user, headers=headers)
 
 
 @router.get('/search', status_code=HTTPStatus.OK, response_model=UserRead)
 async def get_user(
-    repo: UserRepo,
+    repo: UserReadRepo,
     user_email: Annotated[str | None, Query()] = None,
     user_phone: Annotated[str | None, Query()] = None,
 ):
@@ -110,7 +136,9 @@ async def update_user(
 
     # Se a senha for fornecida, aplica um hash nela
     if 'password' in update_data:
-        update_data['password'] = PasswordHasher.hash(update_data['password'])
+        update_data['password'] = await PasswordHasher.hash_async(
+            update_data['password']
+        )
 
     if 'email' in update_data:
         if await repo.get_by_email(update_data['email']):
@@ -139,20 +167,19 @@ async def deactivate_user(
     user_id: int,
     repo: UserRepo,
 ):
-    user = await repo.get_by_id(user_id)
+    user, changed = await repo.set_active(user_id, False)
     if not user:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='User not found'
         )
 
-    if not user.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='User already deactivated',
         )
 
-    user_deactivate = UserStatusChanger(active=False)
-    return await repo.update(user_id, user_deactivate)
+    return user
 
 
 @router.patch(
@@ -164,16 +191,15 @@ async def activate_user(
     user_id: int,
     repo: UserRepo,
 ):
-    user = await repo.get_by_id(user_id)
+    user, changed = await repo.set_active(user_id, True)
     if not user:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='User not found'
         )
 
-    if user.active:
+    if not changed:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail='User already activated'
         )
 
-    user_deactivate = UserStatusChanger(active=True)
-    return await repo.update(user_id, user_deactivate)
+    return user
@@ -3,10 +3,12 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from src.validators.document_validator import CpfCnpj
+
 
 class DestinatarioBase(BaseModel):
     name: str
-    cpf_cnpj: str
+    cpf_cnpj: CpfCnpj
     phone: str
     email: str
 
@@ -22,7 +24,7 @@ class DestinatarioCreate(DestinatarioBase):
     model_config = ConfigDict(extra='forbid', populate_by_name=True)
 
     name: str
-    cpf_cnpj: str
+    cpf_cnpj: CpfCnpj
     phone: str
     email: EmailStr
 
@@ -31,7 +33,7 @@ class DestinatarioUpdate(BaseModel):
     model_config = ConfigDict(extra='forbid', populate_by_name=True)
 
     name: Optional[str] = None
-    cpf_cnpj: Optional[str] = None
+    cpf_cnpj: Optional[CpfCnpj] = None
     phone: Optional[str] = None
     email: Optional[EmailStr] = None
     active: Optional[bool] = None
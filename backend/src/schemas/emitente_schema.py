@@ -2,10 +2,12 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from src.validators.document_validator import Cnpj
+
 
 class EmitenteBase(BaseModel):
     name: str
-    cnpj: str
+    cnpj: Cnpj
     phone: str
     email: EmailStr
 
@@ -25,7 +27,7 @@ class EmitenteUpdate(BaseModel):
     model_config = ConfigDict(extra='forbid', populate_by_name=True)
 
     name: str
-    cnpj: str
+    cnpj: Cnpj
     phone: str
     email: EmailStr
     active: bool
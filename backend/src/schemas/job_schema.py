@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+JobStatus = Literal['pending', 'running', 'succeeded', 'failed']
+
+
+class JobCreate(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    kind: str = Field(..., max_length=50)
+    # Validado pelo schema registrado para o tipo da tarefa
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class JobResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: JobStatus
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class DateRangePayload(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    # Intervalo [start_date, end_date] pela data de criação das notas
+    start_date: date
+    end_date: date
+
+    @model_validator(mode='after')
+    def check_range(self):
+        if self.start_date > self.end_date:
+            raise ValueError('start_date must be before end_date')
+        return self
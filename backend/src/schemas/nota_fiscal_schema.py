@@ -1,7 +1,14 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Any
+
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.schemas.destinatario_schema import DestinatarioRead
+from src.schemas.emitente_schema import EmitenteRead
+from src.settings import settings
+from src.validators.document_validator import CpfCnpj
+
 
 class NotaFiscalBase(BaseModel):
     numero_nota: str = Field(..., max_length=50)
@@ -25,6 +32,11 @@ class NotaFiscalCreate(NotaFiscalBase):
     # Proíbe campos extras no payload de criação
     model_config = ConfigDict(extra='forbid')
 
+    # Documentos conferidos e normalizados apenas na entrada; a NF-e
+    # admite emitente pessoa física, por isso o emitente aceita CPF
+    cnpj_emitente: CpfCnpj = Field(..., max_length=18)
+    cpf_ou_cnpj_destinatario: CpfCnpj = Field(..., max_length=18)
+
 
 class NotaFiscalRead(NotaFiscalBase):
     # Permite leitura a partir de instâncias ORM/dataclasses
@@ -33,7 +45,67 @@ class NotaFiscalRead(NotaFiscalBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    # Cadastros vinculados pelo documento (None quando não cadastrado)
+    emitente_id: int | None = None
+    destinatario_id: int | None = None
+
+
+class NotaFiscalDetail(NotaFiscalRead):
+    emitente: EmitenteRead | None = None
+    destinatario: DestinatarioRead | None = None
 
 
 class NotaFiscalList(BaseModel):
     notas_fiscais: list[NotaFiscalRead]
+    # Cursor opaco para a próxima página (None na última página)
+    next_cursor: str | None = None
+
+
+class NotaFiscalBatchCreate(BaseModel):
+    # Cada item é validado individualmente para reportar erros por item
+    notas_fiscais: list[dict[str, Any]] = Field(
+        ..., min_length=1, max_length=1000
+    )
+
+
+class NotaFiscalPdfBatch(BaseModel):
+    ids: list[int] = Field(
+        ..., min_length=1, max_length=settings.DANFE_BATCH_MAX_SIZE
+    )
+
+
+class NotaFiscalBatchError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class NotaFiscalBatchResult(BaseModel):
+    created: list[NotaFiscalRead]
+    errors: list[NotaFiscalBatchError]
+
+
+class NotaFiscalImportError(BaseModel):
+    source: str
+    error: str
+
+
+class NotaFiscalImportResult(BaseModel):
+    files: int
+    imported: int
+    errors: list[NotaFiscalImportError]
+
+
+class NotaFiscalTotals(BaseModel):
+    cnpj_emitente: str
+    quantidade: int
+    valor_total: Decimal
+    icms: Decimal
+    pis: Decimal
+    cofins: Decimal
+    desconto: Decimal
+
+
+class NotaFiscalTotalsReport(BaseModel):
+    year: int
+    month: int | None = None
+    totals: list[NotaFiscalTotals]
@@ -0,0 +1,336 @@
+"""
+Índice de prefixos em memória para o autocomplete de emitentes e
+destinatários.
+
+Cada worker carrega os cadastros em segundo plano logo após a subida
+da aplicação e, a partir daí, responde as buscas sem ir ao banco. Os
+repositórios atualizam o índice do próprio worker a cada cadastro ou
+alteração; as alterações feitas por outros workers são trazidas pela
+ressincronização periódica, que lê apenas os registros com updated_at
+posterior ao último já visto e atualiza só esses no índice. Os
+cadastros são desativados, nunca excluídos, então não há remoções a
+sincronizar.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from src.db.database import new_session
+from src.models.destinatario_model import DestinatarioModel
+from src.models.emitente_model import EmitenteModel
+from src.normalization import (
+    MIN_DOCUMENT_PREFIX,
+    document_prefix,
+    tokenize,
+)
+from src.schemas.destinatario_schema import DestinatarioRead
+from src.schemas.emitente_schema import EmitenteRead
+from src.settings import settings
+from src.validators.document_validator import document_key
+
+logger = logging.getLogger(__name__)
+
+# Maior caractere possível: fecha o intervalo de um prefixo no bisect
+_PREFIX_END = '\U0010ffff'
+# Registros lidos do banco por vez durante a carga
+LOAD_CHUNK = 5000
+# A ressincronização relê as alterações desse período anterior à última
+# vista: updated_at é o início da transação, que pode ser confirmada
+# depois de uma alteração mais recente
+RESYNC_OVERLAP = timedelta(seconds=60)
+# Acima dessa quantidade de alterações, as listas de chaves são
+# reordenadas por inteiro em vez de receberem uma inserção por registro
+MAX_INCREMENTAL_UPDATES = 1000
+# Acima dessa quantidade de chaves para a palavra mais rara da busca,
+# os nomes são percorridos em ordem em vez de ordenar os candidatos
+MAX_WORD_CANDIDATES = 1000
+
+
+@dataclass(slots=True)
+class _Entry:
+    item: BaseModel
+    name: str
+    words: tuple[str, ...]
+    document: str
+    updated_at: datetime
+
+
+def _prefixed(keys: list[tuple], prefix: str) -> Iterator[tuple]:
+    """Chaves que começam por `prefix`, na ordem da lista"""
+    position = bisect_left(keys, (prefix,))
+    while position < len(keys) and keys[position][0].startswith(prefix):
+        yield keys[position]
+        position += 1
+
+
+def _count_prefixed(keys: list[tuple], prefix: str) -> int:
+    start = bisect_left(keys, (prefix,))
+    return bisect_left(keys, (prefix + _PREFIX_END,), lo=start) - start
+
+
+class PrefixIndex:
+    """
+    Listas ordenadas de chaves terminadas pelo id: (nome, id),
+    (palavra, nome, id) e (documento, id). A busca por prefixo é um
+    bisect seguido da leitura das chaves em ordem, que para assim que
+    `limit` registros são encontrados. Os itens ficam já validados
+    pelo schema de leitura.
+    """
+
+    def __init__(self, model: type, schema: type[BaseModel], document: str):
+        self.model = model
+        self.schema = schema
+        self.document = document
+        self.loaded = False
+        # Maior updated_at já aplicado ao índice
+        self.last_seen: datetime | None = None
+        self.loaded_at: float | None = None
+        self.synced_at: float | None = None
+        self.reloads = 0
+        self.updates = 0
+        self.hits = 0
+        self._entries: dict[int, _Entry] = {}
+        self._name_keys: list[tuple] = []
+        self._word_keys: list[tuple] = []
+        self._document_keys: list[tuple] = []
+
+    def _key_lists(self) -> tuple[list[tuple], ...]:
+        return self._name_keys, self._word_keys, self._document_keys
+
+    def _entry(self, entity: Any) -> _Entry:
+        item = self.schema.model_validate(entity, from_attributes=True)
+        words = tokenize(item.name)
+        return _Entry(
+            item=item,
+            name=' '.join(words),
+            words=tuple(dict.fromkeys(words)),
+            document=document_key(getattr(entity, self.document)),
+            updated_at=entity.updated_at,
+        )
+
+    def _validate(self, entities) -> dict[int, _Entry]:
+        return {entity.id: self._entry(entity) for entity in entities}
+
+    @staticmethod
+    def _keys(entity_id: int, entry: _Entry) -> tuple[list[tuple], ...]:
+        """Chaves do registro, na ordem de _key_lists"""
+        names = [(entry.name, entity_id)]
+        words = [(word, entry.name, entity_id) for word in entry.words]
+        documents = [(entry.document, entity_id)] if entry.document else []
+        return names, words, documents
+
+    def _build(self, entries: dict[int, _Entry]) -> None:
+        """Monta as listas de chaves novas e só então as troca pelas atuais"""
+        key_lists = ([], [], [])
+        for entity_id, entry in entries.items():
+            for keys, added in zip(key_lists, self._keys(entity_id, entry)):
+                keys.extend(added)
+        for keys in key_lists:
+            keys.sort()
+
+        self._entries = entries
+        self._name_keys, self._word_keys, self._document_keys = key_lists
+
+    def _replace(self, entity_id: int, entry: _Entry) -> None:
+        """Troca as chaves de um registro nas listas ordenadas"""
+        old = self._entries.get(entity_id)
+        if old is not None:
+            for keys, removed in zip(
+                self._key_lists(), self._keys(entity_id, old)
+            ):
+                for key in removed:
+                    position = bisect_left(keys, key)
+                    if position < len(keys) and keys[position] == key:
+                        del keys[position]
+
+        self._entries[entity_id] = entry
+        for keys, added in zip(
+            self._key_lists(), self._keys(entity_id, entry)
+        ):
+            for key in added:
+                insort(keys, key)
+
+    async def _read(self, *where) -> list:
+        """Registros que atendem a `where`, lidos em blocos"""
+        async with new_session() as session:
+            result = await session.stream_scalars(
+                select(self.model)
+                .where(*where)
+                .execution_options(yield_per=LOAD_CHUNK)
+            )
+            entities = []
+            # Um bloco por vez, devolvendo o event loop entre eles
+            async for chunk in result.partitions():
+                entities.extend(chunk)
+        return entities
+
+    def _see(self, entities: list) -> None:
+        latest = max((entity.updated_at for entity in entities), default=None)
+        if latest is not None and (
+            self.last_seen is None or latest > self.last_seen
+        ):
+            self.last_seen = latest
+
+    async def load(self) -> None:
+        """Carrega todos os registros da tabela"""
+        entities = await self._read()
+        # Validação e ordenação em uma thread: o worker segue atendendo
+        entries = await asyncio.to_thread(self._validate, entities)
+        await asyncio.to_thread(self._build, entries)
+        self._see(entities)
+        self.loaded = True
+        self.loaded_at = self.synced_at = time.time()
+        self.reloads += 1
+
+    async def resync(self) -> int:
+        """
+        Aplica ao índice os registros alterados desde a última
+        sincronização (sem índice carregado, faz a carga completa).
+        Retorna quantos registros foram atualizados.
+        """
+        if not self.loaded:
+            await self.load()
+            return len(self._entries)
+
+        where = []
+        if self.last_seen is not None:
+            since = self.last_seen - RESYNC_OVERLAP
+            where.append(self.model.updated_at > since)
+        entities = await self._read(*where)
+
+        # Os relidos pela margem e os gravados por este worker já estão
+        # no índice com o mesmo updated_at
+        changed = [
+            entity
+            for entity in entities
+            if (entry := self._entries.get(entity.id)) is None
+            or entry.updated_at != entity.updated_at
+        ]
+        if len(changed) > MAX_INCREMENTAL_UPDATES:
+            entries = await asyncio.to_thread(self._validate, changed)
+            await asyncio.to_thread(self._build, {**self._entries, **entries})
+        else:
+            for entity_id, entry in self._validate(changed).items():
+                self._replace(entity_id, entry)
+
+        self._see(entities)
+        self.synced_at = time.time()
+        self.updates += len(changed)
+        return len(changed)
+
+    def upsert(self, entity: Any) -> None:
+        """Inclui ou atualiza um registro gravado por este worker"""
+        if self.loaded:
+            self._replace(entity.id, self._entry(entity))
+
+    def _word_matches(self, words: list[str], limit: int) -> list[int]:
+        """
+        Até `limit` registros com todas as palavras da busca como início
+        de alguma palavra do nome, em ordem de nome e id. Quando a
+        palavra com menos chaves tem poucas, os candidatos saem delas e
+        são ordenados; senão, os nomes são lidos em ordem até o limite.
+        """
+
+        def matches(entry: _Entry) -> bool:
+            return all(
+                any(word.startswith(query_word) for word in entry.words)
+                for query_word in words
+            )
+
+        counts = {w: _count_prefixed(self._word_keys, w) for w in words}
+        lead = min(words, key=counts.__getitem__)
+        if counts[lead] <= MAX_WORD_CANDIDATES:
+            candidates = {key[-1] for key in _prefixed(self._word_keys, lead)}
+            found = sorted(
+                (self._entries[entity_id].name, entity_id)
+                for entity_id in candidates
+                if matches(self._entries[entity_id])
+            )
+            return [entity_id for _, entity_id in found[:limit]]
+
+        found = []
+        for _, entity_id in self._name_keys:
+            if matches(self._entries[entity_id]):
+                found.append(entity_id)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def search(self, query: str, limit: int) -> list[BaseModel]:
+        """
+        Ordem dos resultados: nomes que começam pela busca, nomes com
+        palavras que começam pelas palavras da busca e documentos que
+        começam pelo documento da busca (document_prefix); cada grupo em
+        ordem de nome (ou documento) e id.
+        """
+        self.hits += 1
+        sources = []
+
+        words = tokenize(query)
+        if words:
+            name = ' '.join(words)
+            sources.append(key[-1] for key in _prefixed(self._name_keys, name))
+            sources.append(self._word_matches(words, limit))
+
+        document = document_prefix(query)
+        if len(document) >= MIN_DOCUMENT_PREFIX:
+            sources.append(
+                key[-1] for key in _prefixed(self._document_keys, document)
+            )
+
+        found: dict[int, BaseModel] = {}
+        for entity_id in chain.from_iterable(sources):
+            if len(found) >= limit:
+                break
+            if entity_id not in found:
+                found[entity_id] = self._entries[entity_id].item
+        return list(found.values())
+
+    def stats(self) -> dict:
+        return {
+            'loaded': self.loaded,
+            'size': len(self._entries),
+            'keys': sum(len(keys) for keys in self._key_lists()),
+            'reloads': self.reloads,
+            'updates': self.updates,
+            'hits': self.hits,
+            'loaded_at': self.loaded_at,
+            'synced_at': self.synced_at,
+        }
+
+
+emitente_index = PrefixIndex(EmitenteModel, EmitenteRead, 'cnpj')
+destinatario_index = PrefixIndex(
+    DestinatarioModel, DestinatarioRead, 'cpf_cnpj'
+)
+search_indexes = {
+    'emitentes': emitente_index,
+    'destinatarios': destinatario_index,
+}
+
+
+async def maintain_search_indexes() -> None:
+    """
+    Tarefa iniciada na subida da aplicação: carrega os índices em
+    segundo plano, sem atrasar a prontidão do worker (até a carga
+    terminar, as buscas vão ao banco), e depois os ressincroniza.
+    """
+    while True:
+        for name, index in search_indexes.items():
+            try:
+                # Sem índice carregado, resync faz a carga completa;
+                # depois, traz só as alterações
+                await index.resync()
+            except Exception:
+                # Falha no banco: mantém o índice atual e tenta de novo
+                logger.exception('Falha ao sincronizar o índice %s', name)
+        await asyncio.sleep(settings.SEARCH_INDEX_RESYNC_SECONDS)
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from zoneinfo import ZoneInfo
@@ -8,12 +10,21 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import user_cache
 from src.db.database import get_session
 from src.repositories.user_repository import UserRepository
 from src.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/token')
 
+# Pool dedicado ao bcrypt: o hash é CPU-bound (~200 ms) e libera o GIL,
+# então roda em threads sem bloquear o event loop. O tamanho do pool é
+# o limite de hashes simultâneos; o excedente aguarda na fila do pool.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix='password-hasher',
+)
+
 
 def get_user_repository(
     session: AsyncSession = Depends(get_session),
@@ -29,7 +40,7 @@ class PasswordHasher:
         garantir a codificação em padrão utf-8
         """
         utf_8_password = password.encode('utf-8')
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hashed_password = bcrypt.hashpw(utf_8_password, salt)
 
         return hashed_password.decode('utf-8')
@@ -45,6 +56,28 @@ class PasswordHasher:
 
         return bcrypt.checkpw(utf_8_password, utf_8_hashed_password)
 
+    @staticmethod
+    async def hash_async(password: str) -> str:
+        """
+        Versão assíncrona de hash, executada no pool do bcrypt
+        para não bloquear o event loop
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _password_executor, PasswordHasher.hash, password
+        )
+
+    @staticmethod
+    async def check_async(password: str, hashed_password: str) -> bool:
+        """
+        Versão assíncrona de check, executada no pool do bcrypt
+        para não bloquear o event loop
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _password_executor, PasswordHasher.check, password, hashed_password
+        )
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -85,9 +118,17 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await user_repo.get_by_email(subject_email)
+    user = user_cache.get(subject_email)
+
+    if user is None:
+        user = await user_repo.get_by_email(subject_email)
+
+        if not user:
+            raise credentials_exception
+
+        user_cache.set(subject_email, user)
 
-    if not user:
+    if not user.active:
         raise credentials_exception
 
     return user
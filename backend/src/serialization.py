@@ -0,0 +1,50 @@
+"""
+Serialização rápida para respostas de listagem.
+
+Com o pydantic v2, o FastAPI valida o retorno da rota pelo
+response_model (lendo os atributos dos objetos ORM, from_attributes),
+converte o resultado em dicionários e listas compatíveis com JSON
+(serialize, em modo 'json') e só então o JSONResponse chama
+json.dumps: a resposta inteira é montada como objetos Python antes de
+virar texto. Aqui a validação é a mesma, mas o JSON é gerado direto
+pelo pydantic-core, sem a cópia intermediária nem o json.dumps.
+"""
+
+from functools import cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@cache
+def _adapter(schema: Any) -> TypeAdapter:
+    # Montar o TypeAdapter compila o validador/serializador; reaproveita
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, content: Any) -> bytes:
+    """Valida `content` (ORM ou dicionários) e gera o JSON de `schema`"""
+    adapter = _adapter(schema)
+    return adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True)
+    )
+
+
+def json_response(
+    schema: Any,
+    content: Any,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Resposta JSON já serializada. Os endpoints mantêm o response_model
+    no decorator para a documentação; como a rota retorna um Response,
+    o FastAPI não repete a validação.
+    """
+    return Response(
+        dump_json(schema, content),
+        status_code=status_code,
+        headers=headers,
+        media_type='application/json',
+    )
@@ -1,3 +1,6 @@
+import os
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +10,39 @@ class TokenSettings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
 
+class PasswordSettings(BaseSettings):
+    # Fator de custo do bcrypt (2^rounds iterações)
+    BCRYPT_ROUNDS: int = 12
+    # Threads dedicadas ao bcrypt; limita quantos hashes rodam ao mesmo tempo
+    PASSWORD_HASH_WORKERS: int = 4
+
+
+class CacheSettings(BaseSettings):
+    # Cache de usuários autenticados em get_current_user (0 desativa).
+    # Cada worker tem o seu: alterar o usuário (desativação, troca de
+    # e-mail) invalida o cache do worker que fez a alteração, e os demais
+    # podem continuar aceitando o usuário antigo por até
+    # USER_CACHE_TTL_SECONDS
+    USER_CACHE_TTL_SECONDS: float = 15
+    USER_CACHE_MAX_SIZE: int = 1024
+    # Resultados memorizados da validação de CPF/CNPJ
+    DOCUMENT_CACHE_MAX_SIZE: int = 65536
+    # Resultados memorizados da validação de telefones
+    PHONE_CACHE_MAX_SIZE: int = 65536
+
+
+class SearchSettings(BaseSettings):
+    # Autocomplete pelo índice de prefixos em memória de cada worker
+    # (opcional: cada worker guarda uma cópia dos cadastros); sem ele, as
+    # buscas vão ao banco
+    SEARCH_INDEX_ENABLED: bool = False
+    # Intervalo entre as leituras das alterações feitas por outros workers
+    SEARCH_INDEX_RESYNC_SECONDS: float = 30
+    # Resultados do autocomplete: padrão e máximo por requisição
+    SEARCH_DEFAULT_LIMIT: int = 10
+    SEARCH_MAX_LIMIT: int = 50
+
+
 class DatabaseSettings(BaseSettings):
     DATABASE_SCHEME: str
     DATABASE_USER: str
@@ -15,6 +51,27 @@ class DatabaseSettings(BaseSettings):
     DATABASE_PORT: int
     DATABASE_SERVER: str
 
+    # Pool de conexões (valores por worker)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    # Cache de prepared statements por conexão do asyncpg
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # Partições mensais de nota_fiscal criadas além do mês atual
+    NOTA_FISCAL_PARTITION_MONTHS_AHEAD: int = 3
+    # Réplica de leitura opcional (URL do SQLAlchemy, com o mesmo
+    # driver do primário); sem ela, as leituras também vão ao primário
+    DATABASE_REPLICA_URL: str | None = None
+    # Após uma escrita, as leituras do mesmo cliente conferem por esse
+    # tempo se a réplica já a aplicou, e vão ao primário enquanto não.
+    # Vale em qualquer worker para clientes que guardam cookies; sem o
+    # cookie, apenas no worker que atendeu a escrita
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5
+    # Clientes sem cookie com escritas recentes, lembrados por worker
+    DATABASE_READ_YOUR_WRITES_MAX_CLIENTS: int = 10000
+
     @property
     def database_url(self) -> str:
         return (
@@ -23,7 +80,78 @@ class DatabaseSettings(BaseSettings):
         )
 
 
-class Settings(TokenSettings, DatabaseSettings):
+class ImportSettings(BaseSettings):
+    # Processos usados no parsing de XML, em cada worker da API (padrão:
+    # núcleos da CPU divididos pela quantidade de workers da API)
+    IMPORT_WORKERS: int | None = None
+    # Notas gravadas por INSERT durante a importação
+    IMPORT_BATCH_SIZE: int = 500
+    # Tamanho máximo do arquivo enviado para importação (bytes)
+    IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+
+
+class JobSettings(BaseSettings):
+    # Processos que executam as tarefas em cada worker da fila
+    # (padrão: núcleos da CPU)
+    JOB_WORKERS: int | None = None
+    # Intervalo entre consultas à fila quando não há tarefas pendentes
+    JOB_POLL_INTERVAL_SECONDS: float = 1
+    # Tentativas por tarefa e espera antes de cada nova tentativa
+    # (multiplicada pelo número de tentativas já feitas)
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_DELAY_SECONDS: float = 30
+    # Tarefa em execução sem sinal de vida do worker por esse tempo
+    # volta para a fila (worker encerrado no meio da execução)
+    JOB_STALE_AFTER_SECONDS: float = 300
+
+
+class DocumentSettings(BaseSettings):
+    # Cache em disco dos PDFs (DANFE) já gerados; pode ser apagado a
+    # qualquer momento e é compartilhado pelos workers
+    DANFE_CACHE_DIR: str = '.cache/danfe'
+    # Tamanho máximo do cache; o worker da fila, que precisa ver o mesmo
+    # diretório, apaga os PDFs usados há mais tempo quando ele passa
+    # disso (0 desativa a limpeza)
+    DANFE_CACHE_MAX_SIZE_MB: int = 1024
+    # Processos que geram os PDFs em lote, em cada worker da API (padrão:
+    # núcleos da CPU divididos pela quantidade de workers da API)
+    DANFE_WORKERS: int | None = None
+    # Notas por requisição de lote e por tarefa enviada a cada processo
+    DANFE_BATCH_MAX_SIZE: int = 500
+    DANFE_BATCH_CHUNK_SIZE: int = 50
+
+
+class ServerSettings(BaseSettings):
+    APP_HOST: str = '0.0.0.0'
+    APP_PORT: int = 8000
+    # development: processo único; production: vários workers
+    SERVER_MODE: Literal['development', 'production'] = 'development'
+    # Quantidade de workers no modo production (padrão: núcleos da CPU)
+    SERVER_WORKERS: int | None = None
+    # Recicla o worker após N requisições (0 desativa)
+    SERVER_MAX_REQUESTS: int = 0
+    # Segundos para concluir requisições em andamento ao encerrar
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+
+    @property
+    def server_workers(self) -> int:
+        """Quantidade de workers da API subidos pelo entrypoint"""
+        if self.SERVER_MODE != 'production':
+            return 1
+        return self.SERVER_WORKERS or os.cpu_count() or 1
+
+
+class Settings(
+    TokenSettings,
+    DatabaseSettings,
+    PasswordSettings,
+    CacheSettings,
+    SearchSettings,
+    ImportSettings,
+    JobSettings,
+    DocumentSettings,
+    ServerSettings,
+):
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+from typing import Annotated, Iterable, Literal
+
+from pydantic import AfterValidator
+
+from src.settings import settings
+
+DocumentKind = Literal['cpf', 'cnpj']
+
+_SEPARATORS = re.compile(r'[\s./-]')
+_NON_ALPHANUMERIC = re.compile(r'[^0-9A-Za-z]')
+_CPF = re.compile(r'\d{11}')
+# CNPJ alfanumérico: 12 caracteres de 0-9/A-Z seguidos de 2 dígitos
+# verificadores numéricos; o CNPJ só com dígitos é um caso particular
+_CNPJ = re.compile(r'[0-9A-Z]{12}\d{2}')
+
+_CPF_WEIGHTS = (range(10, 1, -1), range(11, 1, -1))
+_CNPJ_WEIGHTS = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+
+
+def normalize_document(document: str) -> str:
+    """Remove pontuação e espaços e passa as letras para maiúsculas"""
+    return _SEPARATORS.sub('', document).upper()
+
+
+def document_key(document: str) -> str:
+    """
+    Apenas dígitos e letras, em maiúsculas: a mesma forma das colunas
+    geradas cnpj_digits e cpf_cnpj_digits, usada para comparar
+    documentos gravados com e sem pontuação
+    """
+    return _NON_ALPHANUMERIC.sub('', document).upper()
+
+
+def _check_digits(document: str, weights) -> bool:
+    # Valor de cada caractere: código ASCII - 48 ('0' = 0, 'A' = 17)
+    values = [ord(char) - 48 for char in document]
+    for position, digit_weights in enumerate(weights, len(document) - 2):
+        remainder = sum(map(int.__mul__, values, digit_weights)) % 11
+        expected = 11 - remainder if remainder > 1 else 0
+        if values[position] != expected:
+            return False
+    return True
+
+
+@lru_cache(maxsize=settings.DOCUMENT_CACHE_MAX_SIZE)
+def classify_document(document: str) -> tuple[str, DocumentKind | None]:
+    """
+    Documento normalizado e o seu tipo ('cpf' ou 'cnpj'), ou None
+    quando o formato ou os dígitos verificadores não conferem.
+    Memorizado: lotes e importações repetem os mesmos documentos.
+    """
+    document = normalize_document(document)
+    # Sequências repetidas (000.000.000-00) passam no cálculo
+    if not document or document == document[0] * len(document):
+        return document, None
+
+    for kind, pattern, weights in (
+        ('cpf', _CPF, _CPF_WEIGHTS),
+        ('cnpj', _CNPJ, _CNPJ_WEIGHTS),
+    ):
+        if pattern.fullmatch(document):
+            valid = _check_digits(document, weights)
+            return document, kind if valid else None
+    return document, None
+
+
+def validate_documents(
+    documents: Iterable[str],
+    kinds: Iterable[DocumentKind] = ('cpf', 'cnpj'),
+) -> list[str | None]:
+    """
+    Valida uma coluna inteira de documentos de uma vez: cada valor
+    distinto é verificado uma única vez. Retorna, na mesma ordem, o
+    documento normalizado ou None quando ele é inválido.
+    """
+    documents = list(documents)
+    kinds = frozenset(kinds)
+    checked = {}
+    for document in documents:
+        if document not in checked:
+            normalized, kind = classify_document(document)
+            checked[document] = normalized if kind in kinds else None
+    return [checked[document] for document in documents]
+
+
+def _validator(*kinds: DocumentKind):
+    label = '/'.join(kind.upper() for kind in kinds)
+
+    def validate(document: str) -> str:
+        normalized, kind = classify_document(document)
+        if kind is None:
+            raise ValueError(f'Invalid {label}')
+        if kind not in kinds:
+            raise ValueError(f'Incorrect {label}')
+        return normalized
+
+    return validate
+
+
+valid_cpf = _validator('cpf')
+valid_cnpj = _validator('cnpj')
+valid_cpf_cnpj = _validator('cpf', 'cnpj')
+
+Cpf = Annotated[str, AfterValidator(valid_cpf)]
+Cnpj = Annotated[str, AfterValidator(valid_cnpj)]
+CpfCnpj = Annotated[str, AfterValidator(valid_cpf_cnpj)]
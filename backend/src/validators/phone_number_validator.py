@@ -1,28 +1,53 @@
 import re
+from functools import lru_cache
 from typing import Annotated
 
-from phonenumbers import (
-    PhoneNumberFormat,
-    format_number,
-    is_possible_number,
-    is_valid_number,
-    parse,
-)
 from pydantic import AfterValidator
 
+from src.lazy import lazy_import
+from src.settings import settings
 
-def valid_phone_number(phone_number: str):
-    phone_number = re.sub(r'[^\d+]', '', phone_number)
+# Os metadados de todas as regiões custam ~30 ms na subida; o pacote só
+# é carregado na primeira validação
+phonenumbers = lazy_import('phonenumbers')
+
+_NON_PHONE = re.compile(r'[^\d+]')
+
+
+def normalize_phone_number(phone_number: str) -> str:
+    """Mantém apenas os dígitos e o + do código do país"""
+    return _NON_PHONE.sub('', phone_number)
 
-    parsed_phone_number = parse(phone_number, 'BR')
 
-    if not is_possible_number(parsed_phone_number):
-        raise ValueError('Incorrect phone number')
+@lru_cache(maxsize=settings.PHONE_CACHE_MAX_SIZE)
+def check_phone_number(phone_number: str) -> tuple[str | None, str | None]:
+    """
+    Número no formato E.164 e None, ou None e a mensagem de erro.
+    Memorizado pelo número normalizado: formatações diferentes do
+    mesmo número compartilham o resultado.
+    """
+    try:
+        parsed_phone_number = phonenumbers.parse(phone_number, 'BR')
+    except phonenumbers.NumberParseException:
+        return None, 'Incorrect phone number'
 
-    if not is_valid_number(parsed_phone_number):
-        raise ValueError('Invalid phone number')
+    if not phonenumbers.is_possible_number(parsed_phone_number):
+        return None, 'Incorrect phone number'
 
-    return format_number(parsed_phone_number, PhoneNumberFormat.E164)
+    if not phonenumbers.is_valid_number(parsed_phone_number):
+        return None, 'Invalid phone number'
+
+    formatted = phonenumbers.format_number(
+        parsed_phone_number, phonenumbers.PhoneNumberFormat.E164
+    )
+    return formatted, None
+
+
+def valid_phone_number(phone_number: str):
+    formatted, error = check_phone_number(normalize_phone_number(phone_number))
+    if error:
+        raise ValueError(error)
+    return formatted
 
 
 PhoneNumber = Annotated[str, AfterValidator(valid_phone_number)]
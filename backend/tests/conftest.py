@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+# Valores mínimos para carregar src.settings quando não há um .env; as
+# variáveis já definidas no ambiente têm prioridade
+if not Path('.env').exists():
+    for name, value in {
+        'SECRET_KEY': 'test-secret',
+        'ALGORITHM': 'HS256',
+        'ACCESS_TOKEN_EXPIRE_MINUTES': '30',
+        'DATABASE_SCHEME': 'postgresql+asyncpg',
+        'DATABASE_USER': 'postgres',
+        'DATABASE_PASSWORD': 'postgres',
+        'DATABASE_DB': 'nfse',
+        'DATABASE_PORT': '5432',
+        'DATABASE_SERVER': 'localhost',
+    }.items():
+        os.environ.setdefault(name, value)
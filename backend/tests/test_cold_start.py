@@ -0,0 +1,19 @@
+import statistics
+
+from benchmarks.cold_start import (
+    DEFAULT_MAX_IMPORT_MS,
+    LAZY_MODULES,
+    run_child,
+)
+
+RUNS = 3
+
+
+def test_import_app_is_fast_and_keeps_lazy_modules_out():
+    # Processos novos: a importação em cache deste processo não conta
+    runs = [run_child(startup=False) for _ in range(RUNS)]
+
+    for _, modules in runs:
+        assert [name for name in LAZY_MODULES if name in modules] == []
+    import_ms = statistics.median(timings['import_ms'] for timings, _ in runs)
+    assert import_ms <= DEFAULT_MAX_IMPORT_MS
@@ -0,0 +1,81 @@
+import pytest
+
+from src.validators.document_validator import (
+    classify_document,
+    document_key,
+    valid_cnpj,
+    valid_cpf,
+    valid_cpf_cnpj,
+    validate_documents,
+)
+
+
+@pytest.mark.parametrize(
+    ('document', 'expected'),
+    [
+        ('529.982.247-25', ('52998224725', 'cpf')),
+        ('52998224725', ('52998224725', 'cpf')),
+        ('11.222.333/0001-81', ('11222333000181', 'cnpj')),
+        ('11 222 333 0001 81', ('11222333000181', 'cnpj')),
+        # CNPJ alfanumérico (exemplo da Receita Federal)
+        ('12.ABC.345/01DE-35', ('12ABC34501DE35', 'cnpj')),
+        ('12abc34501de35', ('12ABC34501DE35', 'cnpj')),
+        ('12AA3450000143', ('12AA3450000143', 'cnpj')),
+        ('12AL3450000143', ('12AL3450000143', 'cnpj')),
+    ],
+)
+def test_classify_document_valid(document, expected):
+    assert classify_document(document) == expected
+
+
+@pytest.mark.parametrize(
+    'document',
+    [
+        '529.982.247-24',
+        '11.222.333/0001-80',
+        '12.ABC.345/01DE-36',
+        # Sequências repetidas passam no cálculo dos dígitos
+        '000.000.000-00',
+        '11111111111111',
+        # Letras só são aceitas nos 12 primeiros caracteres do CNPJ
+        '12ABC34501DEAB',
+        '5299822472A',
+        '1234567890',
+        '',
+    ],
+)
+def test_classify_document_invalid(document):
+    assert classify_document(document)[1] is None
+
+
+def test_alphanumeric_cnpjs_with_the_same_digits_differ():
+    assert document_key('12.AA3.450/0001-43') == '12AA3450000143'
+    assert document_key('12AA3450000143') != document_key('12AL3450000143')
+
+
+def test_validators_report_invalid_and_incorrect_kind():
+    assert valid_cpf('529.982.247-25') == '52998224725'
+    assert valid_cnpj('12.abc.345/01de-35') == '12ABC34501DE35'
+    assert valid_cpf_cnpj('11.222.333/0001-81') == '11222333000181'
+
+    with pytest.raises(ValueError, match='Incorrect CPF'):
+        valid_cpf('11.222.333/0001-81')
+    with pytest.raises(ValueError, match='Invalid CNPJ'):
+        valid_cnpj('11.222.333/0001-80')
+
+
+def test_validate_documents_keeps_order_and_filters_kinds():
+    documents = ['529.982.247-25', '11.222.333/0001-81', 'x', '52998224725']
+
+    assert validate_documents(documents) == [
+        '52998224725',
+        '11222333000181',
+        None,
+        '52998224725',
+    ]
+    assert validate_documents(documents, kinds=('cnpj',)) == [
+        None,
+        '11222333000181',
+        None,
+        None,
+    ]
@@ -0,0 +1,34 @@
+import io
+
+from src.importers.nfe_xml import iter_nfe_xml, parse_nfe_xml
+
+NOTA = (
+    '<NFe><infNFe Id="NFe{0}"><ide><serie>1</serie><nNF>{0}</nNF></ide>'
+    '<emit><CNPJ>11222333000181</CNPJ><xNome>ACME</xNome></emit>'
+    '<dest><CPF>52998224725</CPF><xNome>Fulano</xNome></dest>'
+    '<det nItem="1"><prod><CFOP>5102</CFOP></prod></det>'
+    '<total><ICMSTot><vICMS>18.00</vICMS><vNF>100.00</vNF></ICMSTot></total>'
+    '</infNFe></NFe>'
+)
+
+
+def _lote(quantity: int) -> io.BytesIO:
+    notas = ''.join(NOTA.format(number) for number in range(quantity))
+    return io.BytesIO(
+        '<enviNFe xmlns="http://www.portalfiscal.inf.br/nfe">'
+        f'{notas}</enviNFe>'.encode()
+    )
+
+
+def test_iter_nfe_xml_yields_bounded_chunks():
+    chunks = list(iter_nfe_xml(_lote(7), chunk_size=3))
+
+    assert [len(notas) for notas, _ in chunks] == [3, 3, 1]
+    assert [nota['numero_nota'] for nota in chunks[-1][0]] == ['6']
+
+
+def test_parse_nfe_xml_returns_every_nota():
+    notas, errors = parse_nfe_xml(_lote(5))
+
+    assert [nota['numero_nota'] for nota in notas] == ['0', '1', '2', '3', '4']
+    assert errors == []